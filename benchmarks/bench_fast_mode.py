@@ -0,0 +1,85 @@
+"""
+Accuracy vs speed of the heuristic fast mode against the spaCy path.
+
+For every PDF in --corpus (or a few synthetic documents when none is given),
+both modes run on the same lean pages. Reported per document and overall:
+detection time, outline precision/recall/F1 and title agreement against the
+spaCy output, and mean absolute error of the noun/verb ratios on tagged lines.
+
+Usage: python -m benchmarks.bench_fast_mode [--corpus input/]
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+import numpy as np
+from src.common.pdf_parser import PDFParser
+from src.round1_a.heading_detector import HeadingDetector
+from src.round1_a.nlp_registry import get_nlp
+from benchmarks.synthetic_pdf import make_pdf
+
+
+def run_mode(pages: List[Dict[str, Any]], fast: bool):
+    start = time.perf_counter()
+    detector = HeadingDetector(pages, fast=fast)
+    output = detector.classify()
+    return detector, output, time.perf_counter() - start
+
+
+def compare(pdf_path: Path) -> Dict[str, Any]:
+    pages = list(PDFParser.iter_pages(str(pdf_path), lean=True))
+    ref_detector, reference, ref_time = run_mode(pages, fast=False)
+    fast_detector, fast_output, fast_time = run_mode(pages, fast=True)
+
+    expected = {(h["text"], h["page"], h["level"]) for h in reference["outline"]}
+    found = {(h["text"], h["page"], h["level"]) for h in fast_output["outline"]}
+    hits = len(expected & found)
+    precision = hits / len(found) if found else float(not expected)
+    recall = hits / len(expected) if expected else float(not found)
+
+    ref, fast = ref_detector.lines, fast_detector.lines
+    return {
+        "document": pdf_path.name,
+        "spacy_s": round(ref_time, 4),
+        "fast_s": round(fast_time, 4),
+        "precision": round(precision, 3),
+        "recall": round(recall, 3),
+        "f1": round(2 * precision * recall / (precision + recall), 3) if precision + recall else 0.0,
+        "title_match": reference["title"] == fast_output["title"],
+        "noun_ratio_mae": round(float(np.abs(ref.noun_ratio - fast.noun_ratio).mean()), 4) if len(ref) else 0.0,
+        "verb_ratio_mae": round(float(np.abs(ref.verb_ratio - fast.verb_ratio).mean()), 4) if len(ref) else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, default=None, help="directory of PDFs")
+    args = parser.parse_args()
+
+    # > Load the model up front so spaCy timings exclude the one-off load
+    start = time.perf_counter()
+    get_nlp()
+    load_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            pdf_files = sorted(args.corpus.glob("*.pdf"))
+        else:
+            pdf_files = [Path(make_pdf(str(Path(tmp) / f"synthetic_{n}.pdf"), pages=n, seed=n)) for n in (20, 80, 200)]
+        results = [compare(pdf) for pdf in pdf_files]
+
+    summary = {
+        "documents": len(results),
+        "spacy_model_load_s": round(load_time, 3),
+        "spacy_s": round(sum(r["spacy_s"] for r in results), 3),
+        "fast_s": round(sum(r["fast_s"] for r in results), 3),
+        "mean_f1": round(sum(r["f1"] for r in results) / len(results), 3) if results else None,
+        "title_agreement": round(sum(r["title_match"] for r in results) / len(results), 3) if results else None,
+    }
+    print(json.dumps({"summary": summary, "documents": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
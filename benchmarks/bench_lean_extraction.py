@@ -0,0 +1,51 @@
+"""
+Compares the full get_text("dict") extraction path with the lean text-only
+records on a synthetic PDF with a figure on every page: wall time, peak
+Python allocation (tracemalloc) and equality of the lines the detector reads.
+
+Usage: python -m benchmarks.bench_lean_extraction [--pages 300]
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from src.common.pdf_parser import PDFParser
+from src.round1_a.heading_detector import HeadingDetector
+from benchmarks.synthetic_pdf import make_pdf
+
+
+def measure(pdf_path: str, lean: bool):
+    start = time.perf_counter()
+    pages = PDFParser.parse(pdf_path, lean=lean)["pages"]
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    PDFParser.parse(pdf_path, lean=lean)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pages, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_pdf(str(Path(tmp) / "bench.pdf"), pages=args.pages, images=True)
+        full_pages, full_time, full_peak = measure(pdf_path, lean=False)
+        lean_pages, lean_time, lean_peak = measure(pdf_path, lean=True)
+
+    same_lines = all(
+        list(HeadingDetector._iter_page_lines(f)) == list(HeadingDetector._iter_page_lines(l))
+        for f, l in zip(full_pages, lean_pages)
+    )
+    print(f"{args.pages} pages")
+    print(f"  dict: {full_time:.2f}s, peak {full_peak / 2**20:.1f} MiB")
+    print(f"  lean: {lean_time:.2f}s, peak {lean_peak / 2**20:.1f} MiB")
+    print(f"  speedup {full_time / lean_time:.2f}x, allocation {full_peak / lean_peak:.1f}x smaller, same lines: {same_lines}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Peak and retained resident memory of HeadingDetector with and without
+release_pages on a large synthetic PDF.
+
+Each mode runs in a freshly spawned process:
+  list            parse() the full page dicts into a list, keep them (previous behaviour)
+  list_release    the same list, handed over with release_pages=True
+  stream_release  lean iter_pages() with release_pages=True, as batch mode runs
+
+Reported per mode: peak RSS, RSS still held once the detector is built,
+lines and headings (which must match across modes).
+
+Usage: python -m benchmarks.bench_memory [--pages 1000] [--spacy]
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict
+from src.common.pdf_parser import PDFParser
+from src.round1_a.heading_detector import HeadingDetector
+from src.round1_a.nlp_registry import get_nlp
+from benchmarks.synthetic_pdf import make_pdf
+
+MODES = ("list", "list_release", "stream_release")
+
+
+def _rss_mb() -> float:
+    """Current RSS from /proc (Linux); falls back to the peak elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return round(int(f.read().split()[1]) * resource.getpagesize() / 2**20, 1)
+    except OSError:
+        return _peak_rss_mb()
+
+
+def _peak_rss_mb() -> float:
+    # > ru_maxrss is KiB on Linux, bytes on macOS
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def run_mode(pdf_path: str, mode: str, fast: bool) -> Dict[str, Any]:
+    if not fast:
+        get_nlp()
+    baseline = _rss_mb()
+
+    start = time.perf_counter()
+    if mode == "stream_release":
+        pages = PDFParser.iter_pages(pdf_path, lean=True)
+    else:
+        pages = PDFParser.parse(pdf_path)["pages"]
+    detector = HeadingDetector(pages, fast=fast, release_pages=mode != "list")
+    retained = _rss_mb()
+    output = detector.classify()
+
+    return {
+        "mode": mode,
+        "seconds": round(time.perf_counter() - start, 3),
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": _peak_rss_mb(),
+        "retained_rss_mb": retained,
+        "lines": len(detector.lines),
+        "headings": len(output["outline"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--spacy", action="store_true", help="tag with spaCy instead of fast mode")
+    args = parser.parse_args()
+
+    spawn = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_pdf(str(Path(tmp) / "bench.pdf"), pages=args.pages)
+        runs = []
+        for mode in MODES:
+            # > Spawned, not forked, so no run inherits the generator's memory
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                runs.append(pool.submit(run_mode, pdf_path, mode, not args.spacy).result())
+
+    print(json.dumps({"pages": args.pages, "runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Times PDFParser.parse sequentially and with page-range shards across
+worker processes, and checks that the extracted pages are identical.
+
+Usage: python -m benchmarks.bench_parallel_extraction [--pages 2000] [--workers 1 2 4 8]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from src.common.pdf_parser import PDFParser
+from benchmarks.synthetic_pdf import make_pdf
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_pdf(str(Path(tmp) / "bench.pdf"), pages=args.pages)
+        reference = None
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            pages = PDFParser.parse(pdf_path, workers=workers)["pages"]
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference, baseline = pages, elapsed
+            print(
+                f"workers={workers}: {elapsed:.2f}s "
+                f"({args.pages / elapsed:.0f} pages/s, {baseline / elapsed:.2f}x) "
+                f"identical={pages == reference}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark harness for the round1_a pipeline.
+
+Generates synthetic PDFs locally, runs PDFParser + HeadingDetector on each in
+a fresh worker process with a StageRecorder attached, and reports per-stage
+wall time, pages/sec and peak RSS as JSON, so results can be diffed between
+versions.
+
+Usage:
+    python -m benchmarks.bench_pipeline --pages 50 300 \
+        --fonts helv tiro cour --scripts latin=0.7 cjk=0.2 cyrillic=0.1 \
+        --output bench.json
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+from src.common.pdf_parser import PDFParser
+from src.round1_a.heading_detector import HeadingDetector
+from src.round1_a.instrumentation import StageRecorder
+from src.round1_a.nlp_registry import get_nlp
+from src.round1_a.result_cache import code_version
+from benchmarks.synthetic_pdf import make_pdf
+
+
+class ScriptTimedDetector(HeadingDetector):
+    """Also records script detection, which runs per line inside "featurize"."""
+
+    def _get_script(self, text):
+        with self.recorder.stage("script_detection"):
+            return super()._get_script(text)
+
+
+def run_once(pdf_path: str, pages: int) -> Dict[str, Any]:
+    get_nlp()
+    recorder = StageRecorder(Path(pdf_path).name)
+
+    start = time.perf_counter()
+    with recorder.stage("parse"):
+        doc_pages = list(PDFParser.iter_pages(pdf_path, lean=True))
+    detector = ScriptTimedDetector(doc_pages, recorder=recorder)
+    output = detector.classify()
+    total = time.perf_counter() - start
+
+    t = recorder.stages
+    stages = {
+        "parse": t["parse"],
+        "script_detection": t["script_detection"],
+        # > Remaining featurization work: line walking and feature dicts
+        "featurize_other": t["featurize"] - t["script_detection"],
+        "merge": t["merge"],
+        "nlp": t["nlp"],
+        "statistics": t["stats"],
+        "roles": t["roles"],
+        "scoring": t["score"],
+        "threshold": t.get("threshold", 0.0),
+        "refine": t.get("refine", 0.0),
+    }
+    # > Untimed glue: LineTable construction, space_before pass, title and outline assembly
+    stages["other"] = total - sum(stages.values())
+    return {
+        "pages": pages,
+        "lines": len(detector.lines),
+        "headings": len(output["outline"]),
+        "counts": recorder.counts,
+        "stages_s": {k: round(v, 6) for k, v in stages.items()},
+        "total_s": round(total, 6),
+        "pages_per_sec": round(pages / total, 2) if total else None,
+        # > ru_maxrss is KiB on Linux, bytes on macOS
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10), 1
+        ),
+    }
+
+
+def parse_scripts(values: List[str]) -> Dict[str, float]:
+    mix = {}
+    for item in values:
+        name, _, weight = item.partition("=")
+        mix[name] = float(weight or 1.0)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 300])
+    parser.add_argument("--fonts", nargs="+", default=["helv"], help="Latin body font pool")
+    parser.add_argument("--scripts", nargs="+", default=["latin=1"], help="script=weight pairs")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size; the fastest is reported")
+    parser.add_argument("--output", type=Path, default=None, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    scripts = parse_scripts(args.scripts)
+    report = {
+        "code_version": code_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fonts": args.fonts,
+        "scripts": scripts,
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            pdf_path = make_pdf(
+                str(Path(tmp) / f"bench_{pages}.pdf"), pages=pages, fonts=args.fonts, scripts=scripts
+            )
+            runs = []
+            for _ in range(args.repeat):
+                # > A fresh process per run keeps peak RSS and model warmup comparable
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    runs.append(pool.submit(run_once, pdf_path, pages).result())
+            report["runs"].append(min(runs, key=lambda r: r["total_s"]))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
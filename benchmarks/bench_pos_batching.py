@@ -0,0 +1,67 @@
+"""
+Compares per-line spaCy tagging against the batched nlp.pipe stage
+used by HeadingDetector._featurize_pos.
+
+Usage: python -m benchmarks.bench_pos_batching [--pages 300] [--batch-size 256]
+"""
+import argparse
+import copy
+import tempfile
+import time
+from pathlib import Path
+from src.common.pdf_parser import PDFParser
+from src.round1_a.heading_detector import HeadingDetector
+from src.round1_a.nlp_registry import get_nlp
+from src.round1_a.pos_cache import PosMemo
+from benchmarks.synthetic_pdf import make_pdf
+
+
+def per_line_pos(nlp, lines):
+    for line in lines:
+        doc_nlp = nlp(line["text"])
+        total = len(doc_nlp)
+        line["noun_ratio"] = sum(1 for t in doc_nlp if t.pos_ == "NOUN") / total if total else 0
+        line["verb_ratio"] = sum(1 for t in doc_nlp if t.pos_ == "VERB") / total if total else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_pdf(str(Path(tmp) / "bench.pdf"), pages=args.pages)
+        pages = PDFParser.parse(pdf_path)["pages"]
+
+    nlp = get_nlp()
+    # > No memo, so every repeat tags every line
+    detector = HeadingDetector(pages, nlp=nlp, nlp_batch_size=args.batch_size, pos_memo=PosMemo(maxsize=0))
+    reference = [detector.lines.row(i) for i in range(len(detector.lines))]
+    print(f"{args.pages} pages, {len(reference)} merged lines")
+
+    timings = {}
+    for name in ("per_line", "batched"):
+        best = float("inf")
+        for _ in range(args.repeat):
+            lines = copy.deepcopy(reference)
+            start = time.perf_counter()
+            if name == "per_line":
+                per_line_pos(nlp, lines)
+            else:
+                detector._featurize_pos(lines)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = (best, lines)
+        print(f"{name:>9}: {best:.3f}s")
+
+    per_line, batched = timings["per_line"][1], timings["batched"][1]
+    identical = all(
+        a["noun_ratio"] == b["noun_ratio"] and a["verb_ratio"] == b["verb_ratio"]
+        for a, b in zip(per_line, batched)
+    )
+    print(f"speedup: {timings['per_line'][0] / timings['batched'][0]:.2f}x, identical output: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Microbenchmark for script detection: the original per-character range scan
+against the precomputed table in src.round1_a.script_detection.
+
+Usage: python -m benchmarks.bench_script_detection [--lines 20000]
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+from src.round1_a.script_detection import SCRIPT_RANGES, get_script
+
+SAMPLES = [
+    "1.2 System Architecture Overview",
+    "第三章 システムの概要と設計",
+    "Введение в анализ данных",
+    "مقدمة في تحليل البيانات",
+    "परिचय और पृष्ठभूमि",
+    "시스템 개요 및 설계",
+    "บทนำและภาพรวม",
+    "Εισαγωγή στην ανάλυση",
+    "Appendix A: 参考文献 and Ссылки",
+    "🙂 ✓ §",
+]
+
+
+def legacy_get_script(text: str) -> str:
+    if not text:
+        return "Other"
+    counts = defaultdict(int)
+    for char in text:
+        code = ord(char)
+        for script, ranges in SCRIPT_RANGES.items():
+            if any(start <= code <= end for start, end in ranges):
+                counts[script] += 1
+                break
+    return max(counts, key=counts.get) if counts else "Other"
+
+
+def mixed_lines(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        parts = rng.sample(SAMPLES, rng.randint(1, 3))
+        lines.append(" ".join(parts))
+    return lines
+
+
+def time_it(fn, lines, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = mixed_lines(args.lines)
+    mismatches = sum(1 for line in lines if legacy_get_script(line) != get_script(line))
+    legacy = time_it(legacy_get_script, lines, args.repeat)
+    table = time_it(get_script, lines, args.repeat)
+
+    print(f"{args.lines} mixed-script lines")
+    print(f"  legacy range scan: {legacy:.3f}s")
+    print(f"  lookup table:      {table:.3f}s")
+    print(f"  speedup: {legacy / table:.1f}x, mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import random
+from typing import Dict, Optional, Sequence
+import fitz
+
+BODY_WORDS = (
+    "the analysis of system data shows that results from each model are reviewed "
+    "before the process design is approved and documented in the final report"
+).split()
+SECTION_WORDS = ["Overview", "Background", "Method", "Results", "Design", "Evaluation", "Summary"]
+
+# Non-Latin vocabularies and the built-in PyMuPDF font able to render them.
+SCRIPT_SAMPLES = {
+    "cyrillic": ("china-s", "анализ данных система модель результаты отчет процесс проект".split(),
+                 ["Введение", "Обзор", "Методы", "Результаты", "Выводы"]),
+    "cjk": ("china-s", "系统 数据 分析 模型 结果 报告 过程 设计 审查 文档".split(),
+            ["概要", "背景", "方法", "結果", "【まとめ】"]),
+    "hangul": ("korea", "시스템 데이터 분석 모델 결과 보고서 과정 설계".split(),
+               ["개요", "배경", "방법", "결과", "요약"]),
+}
+
+
+def make_pdf(
+    path: str,
+    pages: int = 300,
+    seed: int = 0,
+    images: bool = False,
+    fonts: Sequence[str] = ("helv",),
+    scripts: Optional[Dict[str, float]] = None,
+) -> str:
+    """
+    Writes a synthetic report with a title, numbered section headings,
+    running headers/footers and body paragraphs, and returns its path.
+    With images=True every page also carries a 256x256 RGB figure.
+    fonts is the pool of Latin body fonts; scripts maps "latin" and the keys
+    of SCRIPT_SAMPLES to relative weights, drawn once per section.
+    """
+    rng = random.Random(seed)
+    doc = fitz.open()
+    figure = None
+    if images:
+        figure = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 256, 256), False)
+        figure.set_rect(figure.irect, (40, 120, 200))
+    script_names = list(scripts) if scripts else ["latin"]
+    script_weights = [scripts[s] for s in script_names] if scripts else [1.0]
+
+    for page_num in range(1, pages + 1):
+        page = doc.new_page()
+        page.insert_text((50, 40), "Synthetic Benchmark Report", fontsize=8)
+        y = 80
+        if page_num == 1:
+            page.insert_text((50, y), "Synthetic Benchmark Report", fontsize=24, fontname="hebo")
+            y += 40
+
+        for section in range(1, 3):
+            script = script_names[0] if len(script_names) == 1 else rng.choices(script_names, script_weights)[0]
+            if script == "latin":
+                heading_font = "hebo"
+                body_font = fonts[0] if len(fonts) == 1 else rng.choice(fonts)
+                words, headings = BODY_WORDS, SECTION_WORDS
+            else:
+                heading_font, words, headings = SCRIPT_SAMPLES[script]
+                body_font = heading_font
+
+            if rng.random() < 0.4:
+                heading = f"{page_num}.{section} {rng.choice(headings)}"
+                page.insert_text((50, y), heading, fontsize=14, fontname=heading_font)
+                y += 24
+            for i in range(14):
+                sentence = " ".join(rng.choice(words) for _ in range(11))
+                page.insert_text((50 + (i % 3) * 2, y), sentence, fontsize=10, fontname=body_font)
+                y += 13 + (i % 4)
+            y += 8
+
+        if figure is not None:
+            page.insert_image(fitz.Rect(380, 600, 560, 740), pixmap=figure)
+        page.insert_text((50, 770), f"Page {page_num}", fontsize=8)
+
+    doc.save(path)
+    doc.close()
+    return path
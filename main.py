@@ -1,47 +1,104 @@
-import os
+"""
+Command-line entry point for the document pipeline.
+
+    python main.py extract doc.pdf [--output doc.json] [--fast] [--max-pages N]
+    python main.py batch --input input/ --output output/ --workers 4
+    python main.py serve --port 8080 --workers 2
+    python main.py bench pipeline --pages 50 300
+"""
+import argparse
+import importlib
 import json
-from datetime import datetime
+import sys
+from pathlib import Path
+from src.round1_a.main import add_batch_arguments, extract_outline, positive_int, run_directory
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent / "benchmarks"
+
+
+def _benchmark_names():
+    return sorted(p.stem[len("bench_"):] for p in BENCHMARKS_DIR.glob("bench_*.py"))
+
+
+def cmd_extract(args: argparse.Namespace) -> int:
+    outlines = {}
+    for pdf_path in args.pdf:
+        # > A bad document is reported and skipped; the others are still emitted
+        try:
+            output_data = extract_outline(pdf_path, fast=args.fast, max_pages=args.max_pages)
+        except Exception as e:
+            print(f"Exception in {pdf_path.name}: {e}", file=sys.stderr)
+            continue
+        if output_data is None:
+            print(f"no content in {pdf_path.name}.", file=sys.stderr)
+            continue
+        outlines[pdf_path.name] = output_data
+    if not outlines:
+        return 1
+
+    # > A single document prints its outline as-is; several are keyed by file name
+    result = outlines[args.pdf[0].name] if len(args.pdf) == 1 else outlines
+    text = json.dumps(result, ensure_ascii=False, indent=args.indent or None)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0 if len(outlines) == len(args.pdf) else 1
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    results = run_directory(args)
+    return 0 if all(r["status"] == "ok" for r in results) else 1
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from src.round1_a.service import serve
+    serve(args.host, args.port, args.workers, args.max_pending)
+    return 0
+
 
-from src.round1_a.heading_extractor import extract_headings_from_pdf
+def cmd_bench(args: argparse.Namespace) -> int:
+    module = importlib.import_module(f"benchmarks.bench_{args.name}")
+    # > Benchmarks parse their own options from argv
+    sys.argv = [f"bench {args.name}", *args.bench_args]
+    module.main()
+    return 0
 
-def process_pdf(input_path: str, output_path: str) -> bool:
-    try:
-        title, outline = extract_headings_from_pdf(input_path)
-        output = {
-            "title": title,
-            "outline": outline,
-            "processed_at": datetime.utcnow().isoformat() + "Z"
-        }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
-        return True
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
 
-    except Exception as e:
-        print(f"Error processing {input_path}: {str(e)}")
-        return False
+    extract = commands.add_parser("extract", help="print the outline of one or more PDFs")
+    extract.add_argument("pdf", type=Path, nargs="+")
+    extract.add_argument("--output", type=Path, default=None, help="write JSON here instead of stdout")
+    extract.add_argument("--fast", action="store_true", help="heuristic POS ratios, no spaCy")
+    extract.add_argument("--max-pages", type=positive_int, default=None, help="outline only the first N pages")
+    extract.add_argument("--indent", type=int, default=4, help="JSON indent; 0 writes compact output")
+    extract.set_defaults(handler=cmd_extract)
 
-def main():
-    input_dir = "input"
-    output_dir = "output"
+    batch = commands.add_parser("batch", help="process a directory of PDFs into per-document JSON")
+    add_batch_arguments(batch)
+    batch.set_defaults(handler=cmd_batch)
 
-    if not os.path.exists(input_dir):
-        print(f"❌ Input directory '{input_dir}' does not exist.")
-        return
+    serve = commands.add_parser("serve", help="run the HTTP extraction service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--workers", type=int, default=2, help="worker processes")
+    serve.add_argument("--max-pending", type=int, default=None, help="in-flight request limit")
+    serve.set_defaults(handler=cmd_serve)
 
-    os.makedirs(output_dir, exist_ok=True)
+    bench = commands.add_parser("bench", help="run a benchmark from benchmarks/")
+    bench.add_argument("name", choices=_benchmark_names())
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER, help="options passed to the benchmark")
+    bench.set_defaults(handler=cmd_bench)
+    return parser
 
-    processed = 0
-    for filename in os.listdir(input_dir):
-        if filename.lower().endswith(".pdf"):
-            input_path = os.path.join(input_dir, filename)
-            output_path = os.path.join(output_dir, f"{os.path.splitext(filename)[0]}.json")
 
-            if process_pdf(input_path, output_path):
-                processed += 1
-                print(f"✅ Processed {filename}")
+def main() -> int:
+    args = build_parser().parse_args()
+    return args.handler(args)
 
-    print(f"\n🎉 Completed. Processed {processed} file(s).")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,5 +1,69 @@
 import fitz
-from typing import List, Dict, Any
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
+
+# In-memory PDF sources fitz can open without copying.
+PDFBuffer = Union[bytes, memoryview]
+
+# Text-only extraction: same as the get_text("dict") defaults minus image blocks.
+LEAN_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+def _open_document(
+    pdf_path: str, stream: Optional[PDFBuffer] = None, use_mmap: bool = False
+) -> Tuple["fitz.Document", Optional[Tuple[memoryview, mmap.mmap]]]:
+    """
+    Opens pdf_path, or the given bytes/memoryview without touching the disk.
+    With use_mmap=True a local file is mapped read-only and fitz reads the
+    mapping in place. Returns the document and the (view, mapping) pair, if
+    any, for _close_document.
+    """
+    if stream is None and use_mmap:
+        with open(pdf_path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            return fitz.open(stream=view, filetype="pdf"), (view, mapped)
+        except Exception:
+            view.release()
+            mapped.close()
+            raise
+    if stream is not None:
+        if isinstance(stream, bytearray):
+            # > fitz copies a bytearray into bytes; a view over it is read in place
+            stream = memoryview(stream)
+        return fitz.open(stream=stream, filetype="pdf"), None
+    return fitz.open(pdf_path), None
+
+
+def _close_document(doc: "fitz.Document", mapping: Optional[Tuple[memoryview, mmap.mmap]]) -> None:
+    doc.close()
+    if mapping is not None:
+        # > The view fitz read from must be released before the mapping can close
+        view, mapped = mapping
+        view.release()
+        mapped.close()
+
+
+def _extract_page_range(
+    pdf_path: str, start: int, stop: int, lean: bool = False, use_mmap: bool = False
+) -> List[Dict[str, Any]]:
+    """Worker entry point: opens its own handle and extracts pages [start, stop)."""
+    doc, mapping = _open_document(pdf_path, use_mmap=use_mmap)
+    try:
+        return [PDFParser._extract_page(doc.load_page(n), lean) for n in range(start, stop)]
+    finally:
+        _close_document(doc, mapping)
+
+
+def _page_indices(page_count: int, page_range: Optional[Tuple[int, int]]) -> range:
+    """Zero-based [start, stop) page range clamped to the document; all pages when None."""
+    if page_range is None:
+        return range(page_count)
+    start, stop = page_range
+    return range(max(start, 0), min(stop, page_count))
+
 
 class PDFParser:
     """
@@ -8,19 +72,68 @@ class PDFParser:
     """
 
     @staticmethod
-    def parse(pdf_path: str) -> Dict[str, Any]:
+    def _extract_page(page: "fitz.Page", lean: bool = False) -> Dict[str, Any]:
+        if lean:
+            return PDFParser._extract_lean_page(page)
+        return page.get_text("dict", sort=True)
+
+    @staticmethod
+    def _extract_lean_page(page: "fitz.Page") -> Dict[str, Any]:
+        """
+        Compact page record holding only what heading detection reads:
+        {"width", "height", "lines": [(text, bbox, size, font, flags), ...]},
+        where size/font/flags come from the line's first span. Image blocks are
+        never extracted and the intermediate dict tree is dropped per page.
+        """
+        data = page.get_text("dict", flags=LEAN_TEXT_FLAGS, sort=True)
+        lines = []
+        for block in data["blocks"]:
+            if block.get("type") != 0:
+                continue
+            for line in block["lines"]:
+                spans = line["spans"]
+                if not spans:
+                    continue
+                first = spans[0]
+                text = "".join(span["text"] for span in spans)
+                lines.append((text, line["bbox"], first["size"], first["font"], first["flags"]))
+        return {"width": data["width"], "height": data["height"], "lines": lines}
+
+    @staticmethod
+    def parse(
+        pdf_path: str,
+        workers: int = 1,
+        lean: bool = False,
+        page_range: Optional[Tuple[int, int]] = None,
+        stop_when: Optional[Callable[[int, Dict[str, Any]], bool]] = None,
+        stream: Optional[PDFBuffer] = None,
+        use_mmap: bool = False,
+    ) -> Dict[str, Any]:
         """
         Parses a PDF file and extracts structured text data for each page.
 
         Args:
             pdf_path: The file path to the PDF document.
+            workers: Number of processes for page extraction. Above 1, the page
+                range is split into contiguous shards, each opened separately
+                in a worker, and the results are reassembled in page order.
+            lean: Emit compact text-only page records instead of the full tree.
+            page_range: Zero-based (start, stop) pages to extract; pages outside
+                it are never loaded.
+            stop_when: Called as stop_when(page_index, page_data) after each page;
+                returning True ends extraction after that page. Sharding is
+                skipped when it is given, since pages must be seen in order.
+            stream: PDF bytes or memoryview already in memory; pdf_path then
+                only names the document in messages and no sharding happens.
+            use_mmap: Read a local file through a read-only memory map.
 
         Returns:
             A dictionary containing document metadata and a list of page data.
-            Each page's data is a structured dictionary from get_text("dict").
+            Each page's data is a structured dictionary from get_text("dict"),
+            or a lean record when lean=True.
         """
         try:
-            doc = fitz.open(pdf_path)
+            doc, mapping = _open_document(pdf_path, stream, use_mmap)
         except Exception as e:
             print(f"Error opening or parsing {pdf_path}: {e}")
             return {"pages": [], "metadata": {}}
@@ -31,10 +144,95 @@ class PDFParser:
             "pages": []
         }
 
-        for page_num in range(doc.page_count):
+        indices = _page_indices(doc.page_count, page_range)
+        if workers > 1 and len(indices) > 1 and stop_when is None and stream is None:
+            _close_document(doc, mapping)
+            document_data["pages"] = PDFParser._parse_sharded(
+                pdf_path, indices.start, indices.stop, workers, lean, use_mmap
+            )
+            return document_data
+
+        for page_num in indices:
             page = doc.load_page(page_num)
-            page_data = page.get_text("dict", sort=True)
+            page_data = PDFParser._extract_page(page, lean)
             document_data["pages"].append(page_data)
+            if stop_when is not None and stop_when(page_num, page_data):
+                break
 
-        doc.close()
+        _close_document(doc, mapping)
         return document_data
+
+    @staticmethod
+    def parse_bytes(
+        data: PDFBuffer,
+        lean: bool = False,
+        page_range: Optional[Tuple[int, int]] = None,
+        stop_when: Optional[Callable[[int, Dict[str, Any]], bool]] = None,
+        name: str = "<stream>",
+    ) -> Dict[str, Any]:
+        """
+        parse() for a PDF held in memory, e.g. an uploaded request body. The
+        buffer is read in place (bytes and memoryview are not copied) and
+        nothing is written to disk; name labels the document in messages.
+        """
+        return PDFParser.parse(name, lean=lean, page_range=page_range, stop_when=stop_when, stream=data)
+
+    @staticmethod
+    def _parse_sharded(
+        pdf_path: str, start: int, stop: int, workers: int, lean: bool, use_mmap: bool = False
+    ) -> List[Dict[str, Any]]:
+        # > Two shards per worker evens out pages of uneven cost
+        page_count = stop - start
+        shard_count = min(page_count, workers * 2)
+        bounds = [start + page_count * i // shard_count for i in range(shard_count + 1)]
+        pages = []
+        with ProcessPoolExecutor(max_workers=min(workers, shard_count)) as pool:
+            futures = [
+                pool.submit(_extract_page_range, pdf_path, start, stop, lean, use_mmap)
+                for start, stop in zip(bounds, bounds[1:])
+            ]
+            for future in futures:
+                pages.extend(future.result())
+        return pages
+
+    @staticmethod
+    def iter_pages(
+        pdf_path: str,
+        lean: bool = False,
+        page_range: Optional[Tuple[int, int]] = None,
+        stop_when: Optional[Callable[[int, Dict[str, Any]], bool]] = None,
+        stream: Optional[PDFBuffer] = None,
+        use_mmap: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yields the get_text("dict") structure of each page in order.
+
+        The document is held open only while the generator is being consumed
+        and is closed once it is exhausted or discarded, so at most one page
+        tree is alive at a time.
+
+        Args:
+            pdf_path: The file path to the PDF document.
+            lean: Yield compact text-only page records, as in parse(lean=True).
+            page_range: Zero-based (start, stop) pages to yield, as in parse().
+            stop_when: As in parse(); the page it accepts is still yielded.
+            stream: PDF bytes or memoryview already in memory, as in parse().
+            use_mmap: Read a local file through a read-only memory map.
+
+        Yields:
+            One page dictionary per page, identical to the entries of parse()["pages"].
+        """
+        try:
+            doc, mapping = _open_document(pdf_path, stream, use_mmap)
+        except Exception as e:
+            print(f"Error opening or parsing {pdf_path}: {e}")
+            return
+
+        try:
+            for page_num in _page_indices(doc.page_count, page_range):
+                page_data = PDFParser._extract_page(doc.load_page(page_num), lean)
+                yield page_data
+                if stop_when is not None and stop_when(page_num, page_data):
+                    return
+        finally:
+            _close_document(doc, mapping)
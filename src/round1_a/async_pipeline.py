@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from src.round1_a.instrumentation import StageRecorder
+from src.round1_a.main import (
+    DETECTOR_CONFIG, METRICS_FILE, OUTPUT_DIR, _init_worker, _record_results, extract_outline
+)
+from src.round1_a.manifest import RunManifest
+from src.round1_a.output_sink import OutputSink, PerFileSink
+from src.round1_a.result_cache import ResultCache
+
+
+def _extract_bytes(
+    name: str, data: bytes, fast: bool, max_pages: Optional[int], metrics: bool
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Process-pool entry point: the outline and, with metrics, the metrics line for one PDF in memory."""
+    recorder = StageRecorder(name) if metrics else None
+    output_data = extract_outline(Path(name), recorder=recorder, fast=fast, max_pages=max_pages, stream=data)
+    return output_data, recorder.to_json_line() if recorder is not None else None
+
+
+class IngestPipeline:
+    """
+    Three asyncio stages joined by bounded queues:
+
+    - read: io_threads tasks load PDF bytes (and check the result cache) in a
+      thread pool, so slow or network-mounted input never blocks parsing;
+    - extract: one task per worker process runs PDFParser + HeadingDetector on
+      the bytes in a process pool;
+    - write: a single task hands outlines to the sink, the cache and the
+      manifest in the thread pool.
+
+    Each queue holds at most prefetch items, so reading runs ahead of the
+    CPU by a bounded amount and a slow sink backs the whole pipeline up.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        cache: Optional[ResultCache] = None,
+        metrics: bool = False,
+        fast: bool = False,
+        manifest: Optional[RunManifest] = None,
+        max_pages: Optional[int] = None,
+        output_dir: Path = OUTPUT_DIR,
+        sink: Optional[OutputSink] = None,
+        prefetch: int = 8,
+        io_threads: int = 4,
+    ):
+        self.workers = workers
+        self.cache = cache if cache is not None and cache.enabled else None
+        self.metrics = metrics
+        self.fast = fast
+        self.manifest = manifest
+        self.max_pages = max_pages
+        self.output_dir = Path(output_dir)
+        self.sink = sink if sink is not None else PerFileSink(output_dir)
+        self.prefetch = prefetch
+        self.io_threads = io_threads
+        self.config = {**DETECTOR_CONFIG, "fast": fast, "max_pages": max_pages}
+
+    async def run(self, pdf_files: List[Path]) -> List[Dict[str, Any]]:
+        self._paths: asyncio.Queue = asyncio.Queue()
+        for pdf_path in sorted(pdf_files, key=lambda p: p.stat().st_size, reverse=True):
+            self._paths.put_nowait(pdf_path)
+        self._loaded: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch)
+        self._finished: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch)
+        self._results: List[Dict[str, Any]] = []
+        self._unrecorded: List[Dict[str, Any]] = []
+
+        with ThreadPoolExecutor(max_workers=self.io_threads) as io_pool, ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.fast,)
+        ) as cpu_pool:
+            self._io_pool, self._cpu_pool = io_pool, cpu_pool
+            writer = asyncio.create_task(self._write_stage())
+            extractors = [asyncio.create_task(self._extract_stage()) for _ in range(self.workers)]
+            readers = [asyncio.create_task(self._read_stage()) for _ in range(self.io_threads)]
+            feeder = asyncio.create_task(self._feed(readers, extractors))
+            tasks = [writer, feeder, *extractors, *readers]
+
+            # > If a stage dies, the others would block on its full queue forever;
+            # > cancel them all and let the error propagate instead
+            await asyncio.wait({writer, feeder}, return_when=asyncio.FIRST_EXCEPTION)
+            failed = next((t for t in (writer, feeder) if t.done() and t.exception() is not None), None)
+            if failed is not None:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise failed.exception()
+
+            await self._in_io(_record_results, self.manifest, self.sink, self._unrecorded, True)
+        return self._results
+
+    async def _feed(self, readers: List[asyncio.Task], extractors: List[asyncio.Task]) -> None:
+        """Closes each stage once the one before it has finished."""
+        await asyncio.gather(*readers)
+        for _ in extractors:
+            await self._loaded.put(None)
+        await asyncio.gather(*extractors)
+        await self._finished.put(None)
+
+    async def _in_io(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, func, *args)
+
+    def _load(self, pdf_path: Path) -> Tuple[bytes, str, Optional[str], Optional[Dict[str, Any]]]:
+        data = pdf_path.read_bytes()
+        sha256 = hashlib.sha256(data).hexdigest()
+        if self.cache is None:
+            return data, sha256, None, None
+        key = self.cache.key_for(pdf_path, self.config, content_hash=sha256)
+        return data, sha256, key, self.cache.get(key)
+
+    async def _read_stage(self) -> None:
+        while not self._paths.empty():
+            pdf_path = self._paths.get_nowait()
+            result = {"file": pdf_path.name, "path": pdf_path, "status": "failed", "seconds": 0.0}
+            try:
+                data, sha256, key, cached = await self._in_io(self._load, pdf_path)
+            except OSError as e:
+                result["error"] = str(e)
+                await self._finished.put((result, None, None))
+                continue
+
+            result.update(sha256=sha256, cache_key=key)
+            if cached is not None:
+                print(f"cache hit for {pdf_path.name}")
+                result["status"] = "ok"
+                await self._finished.put((result, cached, None))
+            else:
+                await self._loaded.put((result, data))
+
+    async def _extract_stage(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._loaded.get()
+            if item is None:
+                return
+            result, data = item
+            start = time.perf_counter()
+            output_data = metrics_line = None
+            try:
+                output_data, metrics_line = await loop.run_in_executor(
+                    self._cpu_pool, _extract_bytes, result["file"], data,
+                    self.fast, self.max_pages, self.metrics,
+                )
+            except Exception as e:
+                result["error"] = str(e)
+            del data
+            result["seconds"] = round(time.perf_counter() - start, 3)
+            if output_data is not None:
+                result["status"] = "ok"
+            elif "error" not in result:
+                print(f"no content in {result['file']}.")
+            await self._finished.put((result, output_data, metrics_line))
+
+    def _write(self, result: Dict[str, Any], output_data: Optional[Dict[str, Any]], metrics_line: Optional[str]) -> None:
+        if output_data is not None:
+            try:
+                self.sink.write(result["file"], output_data)
+                if self.cache is not None and result.get("cache_key"):
+                    self.cache.put(result["cache_key"], output_data)
+                if metrics_line is not None:
+                    with open(self.output_dir / METRICS_FILE, 'a', encoding='utf-8') as f:
+                        f.write(metrics_line + "\n")
+            except Exception as e:
+                # > As in process_document: one document fails, the batch goes on
+                print(f"Exception in {result['file']}: {e}")
+                result["status"] = "failed"
+                result["error"] = str(e)
+        print(f"{result['file']}: {result['status']} in {result['seconds']}s")
+        self._unrecorded.append(result)
+        _record_results(self.manifest, self.sink, self._unrecorded)
+
+    async def _write_stage(self) -> None:
+        while True:
+            item = await self._finished.get()
+            if item is None:
+                return
+            result, output_data, metrics_line = item
+            await self._in_io(self._write, result, output_data, metrics_line)
+            result.pop("cache_key", None)
+            self._results.append(result)
+
+
+def run_pipeline(pdf_files: List[Path], **options) -> List[Dict[str, Any]]:
+    """Runs IngestPipeline(**options) over pdf_files to completion; returns one result per file."""
+    return asyncio.run(IngestPipeline(**options).run(pdf_files))
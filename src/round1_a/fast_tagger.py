@@ -0,0 +1,68 @@
+import re
+from typing import Tuple
+
+# Tokens are numbers (kept whole, e.g. "4.2"), words or single punctuation marks,
+# roughly as spaCy splits them.
+_TOKEN_RE = re.compile(r"\d+(?:[.,:]\d+)*|\w+(?:[-'’]\w+)*|[^\w\s]")
+
+_FUNCTION_WORDS = frozenset("""
+a an the this that these those some any each every no all both either neither
+i you he she it we they me him her us them my your his its our their mine yours
+and or but nor so yet if then than because while although though unless whether
+of in on at by for with about against between into through during before after
+above below to from up down over under again further per via within without
+is are was were be been being am do does did have has had having will would
+shall should can could may might must not as also only very just more most
+what which who whom whose when where why how there here
+""".split())
+
+_COMMON_VERBS = frozenset("""
+make use show provide describe define apply include create build run set get
+give take find see know need want follow support improve manage ensure allow
+develop implement perform explain understand compare evaluate review discuss
+consider determine identify install configure select submit read write
+""".split())
+
+_VERB_SUFFIXES = ("ing", "ed", "ize", "ise", "ify", "izes", "ises", "ifies")
+_NOUN_SUFFIXES = (
+    "tion", "sion", "ment", "ness", "ity", "ance", "ence", "ism", "ist", "ship",
+    "age", "ure", "ery", "dom", "hood", "ology", "er", "or", "ions", "ments",
+)
+_NON_NOUN_SUFFIXES = ("ly", "ous", "ful", "ive", "able", "ible", "less", "ical", "ic", "al")
+
+
+def _tag(token: str) -> str:
+    """Coarse tag: NOUN, VERB or X (anything else)."""
+    if not token[0].isalpha():
+        return "X"
+    word = token.lower()
+    if word in _FUNCTION_WORDS:
+        return "X"
+    if word in _COMMON_VERBS or (word.endswith("s") and word[:-1] in _COMMON_VERBS):
+        return "VERB"
+    if len(word) > 4 and word.endswith(_VERB_SUFFIXES):
+        return "VERB"
+    if word.endswith(_NOUN_SUFFIXES):
+        return "NOUN"
+    if len(word) > 4 and word.endswith(_NON_NOUN_SUFFIXES):
+        return "X"
+    # > Unknown open-class words are most often nouns in headings and labels
+    return "NOUN"
+
+
+def pos_ratios(text: str) -> Tuple[float, float]:
+    """
+    Approximates spaCy's (noun_ratio, verb_ratio) for a line with a lexicon and
+    suffix rules. No model is loaded; this backs HeadingDetector's fast mode.
+    """
+    tokens = _TOKEN_RE.findall(text)
+    if not tokens:
+        return 0, 0
+    nouns = verbs = 0
+    for token in tokens:
+        tag = _tag(token)
+        if tag == "NOUN":
+            nouns += 1
+        elif tag == "VERB":
+            verbs += 1
+    return nouns / len(tokens), verbs / len(tokens)
@@ -1,82 +1,153 @@
 import re
-import math
-from collections import Counter, defaultdict
-from typing import List, Dict, Any
-import spacy
+from collections import defaultdict
+from typing import TYPE_CHECKING, List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+import numpy as np
+from src.round1_a.line_table import (
+    LineTable, CONTENT, POTENTIAL_HEADER, POTENTIAL_FOOTER, NOISE, H1_KEYWORD
+)
+from src.round1_a.instrumentation import NULL_RECORDER, StageRecorder
+from src.round1_a.nlp_registry import get_nlp, pipeline_key
+from src.round1_a.scoring import score_lines
+from src.round1_a.script_detection import get_script
+from src.round1_a import fast_tagger
+from src.round1_a.pos_cache import SHARED_POS_MEMO, PosMemo
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+# Scripts the English spaCy pipeline produces meaningful POS tags for.
+NLP_SCRIPTS = frozenset({"Latin"})
+
+# Minimum pages behind the document statistics when extraction stops early.
+STATS_SAMPLE_PAGES = 10
+
+
+def _drain(pages: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yields the pages of a list while clearing its slots, so consumed pages can be freed."""
+    try:
+        for i in range(len(pages)):
+            page, pages[i] = pages[i], None
+            yield page
+    finally:
+        pages.clear()
 
 
 class HeadingDetector:
     """
     Heading detection engine using statistical and linguistic features.
+
+    Pages may be a list or any iterable such as PDFParser.iter_pages; they are
+    consumed once, in order, during featurization. An optional StageRecorder
+    receives per-pass durations and line/candidate counts. With fast=True the
+    noun/verb ratios come from the built-in fast_tagger and spaCy is never loaded.
+    POS ratios are memoised per exact line text in pos_memo, which defaults
+    to the process-wide SHARED_POS_MEMO.
+
+    max_pages (at least 1) and stop_when(page_index, page) end the walk early,
+    so only that window is featurized and classified. As in PDFParser, page_index is the
+    zero-based index in the document; first_page is the one-based number of
+    the first page received. When the window is shorter than stats_sample_pages, following
+    pages are read (but never classified) so the font and spacing statistics
+    still rest on a sensible sample.
+
+    With release_pages=True the detector drops its reference to doc_pages and
+    empties a list of pages as it reads it, so page trees are freed once
+    featurized and memory scales with the number of lines, not pages.
     """
 
-    def __init__(self, doc_pages: List[Dict[str, Any]]):
+    def __init__(
+        self,
+        doc_pages: Iterable[Dict[str, Any]],
+        nlp: Optional["Language"] = None,
+        nlp_batch_size: int = 256,
+        recorder: Optional[StageRecorder] = None,
+        nlp_scripts: Iterable[str] = NLP_SCRIPTS,
+        fast: bool = False,
+        pos_memo: Optional[PosMemo] = None,
+        max_pages: Optional[int] = None,
+        stop_when: Optional[Callable[[int, Dict[str, Any]], bool]] = None,
+        first_page: int = 1,
+        stats_sample_pages: int = STATS_SAMPLE_PAGES,
+        release_pages: bool = False,
+    ):
+        if max_pages is not None and max_pages < 1:
+            raise ValueError(f"max_pages must be at least 1, got {max_pages}")
         self.doc_pages = doc_pages
-        try:
-            self.nlp = spacy.load("en_core_web_sm", disable=["parser", "ner"])
-        except OSError:
-            raise RuntimeError("Failed to load SpaCy model.")
-        
+        self.nlp_batch_size = nlp_batch_size
+        self.nlp_scripts = frozenset(nlp_scripts)
+        self.recorder = recorder if recorder is not None else NULL_RECORDER
+        self.page_count = 0
+        self.max_pages = max_pages
+        self.stop_when = stop_when
+        self.first_page = first_page
+        self.stats_sample_pages = stats_sample_pages
+        self.release_pages = release_pages
+        self.fast = fast
+        self.pos_memo = pos_memo if pos_memo is not None else SHARED_POS_MEMO
+        # > Reuse the process-wide pipeline unless the caller injects its own
+        if fast:
+            self.nlp = None
+        else:
+            self.nlp = nlp if nlp is not None else get_nlp()
+
         self.lines = self._preprocess_and_featurize()
-        self.stats = self._calculate_document_statistics()
-        self._tag_contextual_roles()
+        with self.recorder.stage("stats"):
+            self.stats = self._calculate_document_statistics()
+        with self.recorder.stage("roles"):
+            self._tag_contextual_roles()
         self.classified_headings = []
 
     # === Pass 1: Preprocessing / Featurization === #
 
     def _get_script(self, text: str) -> str:
-        if not text:
-            return "Other"
-
-        scripts = {
-            "Latin": [(0x0020, 0x024F)], "Cyrillic": [(0x0400, 0x052F)],
-            "Arabic": [(0x0600, 0x06FF)], "Hebrew": [(0x0590, 0x05FF)],
-            "Devanagari": [(0x0900, 0x097F)], "Bengali": [(0x0980, 0x09FF)],
-            "Gurmukhi": [(0x0A00, 0x0A7F)], "Gujarati": [(0x0A80, 0x0AFF)],
-            "Oriya": [(0x0B00, 0x0B7F)], "Tamil": [(0x0B80, 0x0BFF)],
-            "Telugu": [(0x0C00, 0x0C7F)], "Kannada": [(0x0C80, 0x0CFF)],
-            "Malayalam": [(0x0D00, 0x0D7F)], "Sinhala": [(0x0D80, 0x0DFF)],
-            "Thai": [(0x0E00, 0x0E7F)], "Lao": [(0x0E80, 0x0EFF)],
-            "Tibetan": [(0x0F00, 0x0FFF)], "Myanmar": [(0x1000, 0x109F)],
-            "Georgian": [(0x10A0, 0x10FF)], "Hangul": [(0xAC00, 0xD7AF)],
-            "Greek": [(0x0370, 0x03FF)], "Armenian": [(0x0530, 0x058F)],
-            "CJK": [(0x4E00, 0x9FFF), (0x3400, 0x4DBF), (0x3040, 0x30FF)]
-        }
-
-        counts = defaultdict(int)
-        for char in text:
-            code = ord(char)
-            for script, ranges in scripts.items():
-                if any(start <= code <= end for start, end in ranges):
-                    counts[script] += 1
+        return get_script(text)
+
+    def _preprocess_and_featurize(self) -> LineTable:
+        fragments, sample = [], []
+        pages = self._page_source()
+        raw_count = 0
+
+        stopped = False
+        while True:
+            page_num = self.first_page + self.page_count
+            read = self._read_page(pages, page_num, fragments)
+            if read is None:
+                break
+            page, raw_lines = read
+            self.page_count += 1
+            raw_count += raw_lines
+            if (self.max_pages is not None and self.page_count >= self.max_pages) or (
+                self.stop_when is not None and self.stop_when(page_num - 1, page)
+            ):
+                stopped = True
+                break
+        read = page = None
+
+        if stopped:
+            # > Top a short window up to the statistics sample; these pages are never classified
+            sample_pages = 0
+            while self.page_count + sample_pages < self.stats_sample_pages:
+                if self._read_page(pages, self.first_page + self.page_count + sample_pages, sample) is None:
                     break
-        return max(counts, key=counts.get) if counts else "Other"
-
-    def _preprocess_and_featurize(self) -> List[Dict[str, Any]]:
-        raw_lines = []
-
-        for i, page in enumerate(self.doc_pages):
-            page_width = page.get("width", 612)
-            page_height = page.get("height", 792)
-            page_dims = {"width": page_width, "height": page_height}
-
-            for block in page.get("blocks", []):
-                if block.get("type") != 0:
-                    continue
-                for line in block.get("lines", []):
-                    spans = line.get("spans", [])
-                    if not spans:
-                        continue
-                    text = "".join(span["text"] for span in spans).strip()
-                    if not text:
-                        continue
-                    raw_lines.append(
-                        self._extract_initial_features(line, text, i + 1, page_dims)
-                    )
-
-        merged_lines = self._merge_fragmented_lines(raw_lines)
+                sample_pages += 1
+            self.recorder.count("stats_sample_pages", sample_pages)
+            # > Release a streaming source (e.g. PDFParser.iter_pages) right away
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+
+        self.sample_font_size, self.sample_space_before = self._sample_statistics(sample)
+
+        with self.recorder.stage("featurize"):
+            merged_lines = [
+                self._extract_initial_features(parts, bbox, lead) for parts, bbox, lead in fragments
+            ]
+        self.recorder.count("pages", self.page_count)
+        self.recorder.count("raw_lines", raw_count)
+        self.recorder.count("lines", len(merged_lines))
 
         for i, line in enumerate(merged_lines):
+            line["line_index"] = i
             prev_line = (
                 merged_lines[i - 1] if i > 0 and merged_lines[i - 1]["page_num"] == line["page_num"] else None
             )
@@ -84,147 +155,260 @@ class HeadingDetector:
                 line["bbox"][1] - prev_line["bbox"][3] if prev_line else 20.0
             )
 
-            doc_nlp = self.nlp(line["text"])
-            total = len(doc_nlp)
-            line["noun_ratio"] = sum(1 for t in doc_nlp if t.pos_ == "NOUN") / total if total else 0
-            line["verb_ratio"] = sum(1 for t in doc_nlp if t.pos_ == "VERB") / total if total else 0
-
-        return merged_lines
-
-    def _extract_initial_features(self, line, text, page_num, page_dims):
-        span = line["spans"][0]
-        height = page_dims["height"]
+        with self.recorder.stage("nlp"):
+            self._featurize_pos(merged_lines)
+        return LineTable(merged_lines)
+
+    def _page_source(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterator over the input pages. With release_pages the detector keeps no
+        reference to them, and a list passed in is emptied as it is read, so
+        each page tree can be freed as soon as it has been featurized.
+        """
+        pages = self.doc_pages
+        if not self.release_pages:
+            return iter(pages)
+        self.doc_pages = None
+        if isinstance(pages, list):
+            return _drain(pages)
+        return iter(pages)
+
+    def _read_page(
+        self, pages: Iterator[Dict[str, Any]], page_num: int, fragments: List[tuple]
+    ) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Reads the next page and merges its fragments into fragments straight
+        away (merges never cross pages), so only merged lines outlive it.
+        Returns the page and its raw line count, or None when pages are exhausted.
+        """
+        with self.recorder.stage("featurize"):
+            page = next(pages, None)
+            if page is None:
+                return None
+            raw_lines = []
+            self._collect_raw_lines(page, page_num, raw_lines)
+        with self.recorder.stage("merge"):
+            fragments.extend(self._merge_fragmented_lines(raw_lines))
+        return page, len(raw_lines)
+
+    def _collect_raw_lines(self, page: Dict[str, Any], page_num: int, raw_lines: List[tuple]) -> None:
+        page_height = page.get("height", 792)
+        for text, bbox, size, font, flags in self._iter_page_lines(page):
+            text = text.strip()
+            if not text:
+                continue
+            # > Raw geometry only; features are built once per merged line
+            raw_lines.append((page_num, text, bbox, round(size, 2), font, flags, page_height))
+
+    @staticmethod
+    def _sample_statistics(fragments: List[tuple]) -> Tuple[np.ndarray, np.ndarray]:
+        """Font sizes and space_before of statistics-only lines, as computed for classified ones."""
+        font_size = np.array([lead[3] for _, _, lead in fragments], dtype=np.float64)
+        space_before = np.full(len(fragments), 20.0)
+        for i in range(1, len(fragments)):
+            prev, curr = fragments[i - 1], fragments[i]
+            if prev[2][0] == curr[2][0]:
+                space_before[i] = curr[1][1] - prev[1][3]
+        return font_size, space_before
+
+    @staticmethod
+    def _iter_page_lines(page: Dict[str, Any]) -> Iterable[tuple]:
+        """Yields (text, bbox, size, font, flags) per line from a full or lean page record."""
+        if "lines" in page:
+            yield from page["lines"]
+            return
+        for block in page.get("blocks", []):
+            if block.get("type") != 0:
+                continue
+            for line in block.get("lines", []):
+                spans = line.get("spans", [])
+                if not spans:
+                    continue
+                first = spans[0]
+                text = "".join(span["text"] for span in spans)
+                yield text, line["bbox"], first["size"], first["font"], first["flags"]
+
+    def _featurize_pos(self, lines: List[Dict[str, Any]]) -> None:
+        """
+        Fills noun/verb ratios by streaming line texts through nlp.pipe in batches.
+        Only lines in one of self.nlp_scripts are tagged; the rest get neutral 0 ratios.
+        Texts already in the POS memo, or repeated within the document, are tagged once.
+        """
+        tagged = []
+        for line in lines:
+            if line["script"] in self.nlp_scripts:
+                tagged.append(line)
+            else:
+                line["noun_ratio"] = line["verb_ratio"] = 0
+        self.recorder.count("nlp_lines", len(tagged))
+
+        tagger = "fast" if self.fast else pipeline_key(self.nlp)
+        hits_before, misses_before = self.pos_memo.hits, self.pos_memo.misses
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        for line in tagged:
+            text = line["text"]
+            if text in pending:
+                pending[text].append(line)
+                continue
+            ratios = self.pos_memo.get(tagger, text)
+            if ratios is None:
+                pending[text] = [line]
+            else:
+                line["noun_ratio"], line["verb_ratio"] = ratios
+
+        if self.fast:
+            results = (fast_tagger.pos_ratios(text) for text in pending)
+        else:
+            results = (self._pos_ratios(doc) for doc in self.nlp.pipe(pending, batch_size=self.nlp_batch_size))
+        for text, ratios in zip(pending, results):
+            self.pos_memo.put(tagger, text, ratios)
+            for line in pending[text]:
+                line["noun_ratio"], line["verb_ratio"] = ratios
+
+        self.recorder.count("pos_memo_hits", self.pos_memo.hits - hits_before)
+        self.recorder.count("pos_memo_misses", self.pos_memo.misses - misses_before)
+        self.recorder.count("pos_tagged", len(pending))
+
+    @staticmethod
+    def _pos_ratios(doc_nlp) -> tuple:
+        total = len(doc_nlp)
+        noun_ratio = sum(1 for t in doc_nlp if t.pos_ == "NOUN") / total if total else 0
+        verb_ratio = sum(1 for t in doc_nlp if t.pos_ == "VERB") / total if total else 0
+        return noun_ratio, verb_ratio
+
+    def _extract_initial_features(self, parts: List[str], bbox, lead: tuple) -> Dict[str, Any]:
+        page_num, lead_text, lead_bbox, font_size, font, flags, height = lead
+        # > Script, caps, word count and position describe the leading fragment,
+        # > exactly as when features were taken before merging
+        script = self._get_script(lead_text)
         return {
-            "text": text,
+            "text": " ".join(parts) if len(parts) > 1 else lead_text,
             "page_num": page_num,
-            "bbox": line["bbox"],
-            "font_size": round(span["size"], 2),
-            "font_name": span["font"],
-            "script": self._get_script(text),
+            "bbox": bbox,
+            "font_size": font_size,
+            "font_name": font,
+            "script": script,
             "role": "content",
-            "is_bold": "bold" in span["font"].lower() or (span["flags"] & 1 << 4),
-            "is_all_caps": text.isupper() and len(text) > 2 and self._get_script(text) == "Latin",
-            "word_count": len(text.split()),
-            "y_percent": line["bbox"][1] / height if height else 0
+            "is_bold": "bold" in font.lower() or (flags & 1 << 4),
+            "is_all_caps": lead_text.isupper() and len(lead_text) > 2 and script == "Latin",
+            "word_count": len(lead_text.split()),
+            "y_percent": lead_bbox[1] / height if height else 0
         }
 
-    def _merge_fragmented_lines(self, lines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        if not lines:
-            return []
-
+    def _merge_fragmented_lines(self, raw_lines: List[tuple]) -> List[tuple]:
+        """
+        Folds consecutive raw lines on the same page with the same font size whose
+        vertical gap is under 0.4 x that size. Returns one (text parts, bbox,
+        leading raw line) tuple per merged line.
+        """
         merged = []
-        buffer = lines[0]
+        parts = box = lead = None
 
-        for curr in lines[1:]:
-            vertical_gap = abs(curr["bbox"][1] - buffer["bbox"][3])
+        for raw in raw_lines:
+            page_num, text, (x0, y0, x1, y1), font_size = raw[:4]
             if (
-                curr["page_num"] == buffer["page_num"]
-                and curr["font_size"] == buffer["font_size"]
-                and vertical_gap < buffer["font_size"] * 0.4
+                lead is not None
+                and page_num == lead[0]
+                and font_size == lead[3]
+                and abs(y0 - box[3]) < font_size * 0.4
             ):
-                buffer["text"] += " " + curr["text"]
-                buffer["bbox"] = (
-                    min(buffer["bbox"][0], curr["bbox"][0]),
-                    min(buffer["bbox"][1], curr["bbox"][1]),
-                    max(buffer["bbox"][2], curr["bbox"][2]),
-                    max(buffer["bbox"][3], curr["bbox"][3])
-                )
+                parts.append(text)
+                if x0 < box[0]: box[0] = x0
+                if y0 < box[1]: box[1] = y0
+                if x1 > box[2]: box[2] = x1
+                if y1 > box[3]: box[3] = y1
             else:
-                merged.append(buffer)
-                buffer = curr
+                if lead is not None:
+                    merged.append((parts, tuple(box), lead))
+                parts, box, lead = [text], list(raw[2]), raw
 
-        merged.append(buffer)
+        if lead is not None:
+            merged.append((parts, tuple(box), lead))
         return merged
 
     # === Pass 2: Statistical & Contextual Analysis === #
 
     def _calculate_document_statistics(self) -> Dict[str, float]:
-        content = [l for l in self.lines if 7 < l["font_size"] < 30]
-        if not content:
+        # > Classified lines plus any statistics-only sample pages after an early stop
+        all_sizes = np.concatenate((self.lines.font_size, self.sample_font_size))
+        all_spaces = np.concatenate((self.lines.space_before, self.sample_space_before))
+        content = (all_sizes > 7) & (all_sizes < 30)
+        if not content.any():
             return {"mean_size": 10, "std_dev_size": 1, "body_size": 10, "mean_space": 3}
 
-        font_sizes = [l["font_size"] for l in content]
-        spaces = [l["space_before"] for l in content if 0 < l["space_before"] < 20]
-        mean = sum(font_sizes) / len(font_sizes)
-        std_dev = math.sqrt(sum((s - mean) ** 2 for s in font_sizes) / len(font_sizes)) if len(font_sizes) > 1 else 1.0
+        font_sizes = all_sizes[content]
+        spaces = all_spaces[content]
+        spaces = spaces[(spaces > 0) & (spaces < 20)]
+        std_dev = float(font_sizes.std()) if len(font_sizes) > 1 else 1.0
+
+        # > Most common size; ties go to the size seen first
+        sizes, first_seen, counts = np.unique(font_sizes, return_index=True, return_counts=True)
+        body_size = sizes[np.lexsort((first_seen, -counts))[0]]
 
         return {
-            "mean_size": mean,
+            "mean_size": float(font_sizes.mean()),
             "std_dev_size": max(std_dev, 1.0),
-            "body_size": Counter(font_sizes).most_common(1)[0][0],
-            "mean_space": sum(spaces) / len(spaces) if spaces else 3.0
+            "body_size": float(body_size),
+            "mean_space": float(spaces.mean()) if len(spaces) else 3.0
         }
 
     def _tag_contextual_roles(self):
-        noise = defaultdict(list)
-        for line in self.lines:
-            if line["y_percent"] < 0.10:
-                line["role"] = "potential_header"
-            elif line["y_percent"] > 0.90:
-                line["role"] = "potential_footer"
-
-            if line["role"] in {"potential_header", "potential_footer"}:
-                noise[line["text"]].append(line)
+        t = self.lines
+        t.role[t.y_percent < 0.10] = POTENTIAL_HEADER
+        t.role[t.y_percent > 0.90] = POTENTIAL_FOOTER
 
-        for text, lines in noise.items():
-            if len(set(l["page_num"] for l in lines)) > 1:
-                for l in lines:
-                    l["role"] = "noise"
+        # > Header/footer texts repeated on more than one page are running noise
+        edge_rows = np.flatnonzero((t.role == POTENTIAL_HEADER) | (t.role == POTENTIAL_FOOTER))
+        pages_by_text = defaultdict(set)
+        for i in edge_rows:
+            pages_by_text[t.text[i]].add(t.page_num[i])
+        noise_rows = [i for i in edge_rows if len(pages_by_text[t.text[i]]) > 1]
+        t.role[noise_rows] = NOISE
 
-        keywords = {'en': ['chapter', 'introduction', 'conclusion', 'references', 'appendix']}
-        for line in self.lines:
-            if line["word_count"] < 5 and any(line["text"].lower().startswith(k) for k in keywords['en']):
-                line["role"] = "h1_keyword"
+        keywords = {'en': ('chapter', 'introduction', 'conclusion', 'references', 'appendix')}
+        short_rows = np.flatnonzero(t.word_count < 5)
+        keyword_rows = [i for i in short_rows if t.text[i].lower().startswith(keywords['en'])]
+        t.role[keyword_rows] = H1_KEYWORD
 
 
     ### Pass 3: The Hybrid Scoring & Classification Engine
 
-    def _get_heading_score(self, line: Dict[str, Any]) -> float:
-        """Calculates a heading score using the hybrid engine."""
-        if line['role'] in ('noise', 'potential_footer') or not (0 < line['word_count'] < 35) or line['text'].endswith((':', '：')):
-            return 0
-        
-        z_size = (line['font_size'] - self.stats['mean_size']) / self.stats['std_dev_size']
-        space_ratio = line['space_before'] / self.stats['mean_space'] if self.stats['mean_space'] > 0 else 1
-        stat_score = max(0, z_size) * 3.0 + max(0, space_ratio - 1) * 1.5
-
-        boost = 0
-        if line['is_bold']: boost += 2.0
-        if line['is_all_caps']: boost += 1.5
-        if line['noun_ratio'] > 0.4 and line['verb_ratio'] < 0.1: boost += 2.0
-        if line['script'] == 'CJK' and '【' in line['text']: boost += 5.0
-        if re.match(r'^\s*(\d{1,2}(\.\d{1,2})*|[A-Z]\.|[IVXLCDM]+\.)', line['text']): boost += 4.5
-        return stat_score + boost
-
     def classify(self) -> Dict[str, Any]:
         """This method executes the entire classification pipeline using the dynamic scoring engine"""
         
-        scored_lines = []
-        for line in self.lines:
-            if line['role'] == 'h1_keyword':
-                line['level'] = 'H1'; self.classified_headings.append(line)
-            elif line['role'] == 'content':
-                score = self._get_heading_score(line)
-                if score > 0: line['score'] = score; scored_lines.append(line)
+        for i in np.flatnonzero(self.lines.role == H1_KEYWORD):
+            line = self.lines.row(i)
+            line['level'] = 'H1'; self.classified_headings.append(line)
+
+        with self.recorder.stage("score"):
+            all_scores = score_lines(self.lines, self.stats)
+            scored_rows = np.flatnonzero((self.lines.role == CONTENT) & (all_scores > 0))
+        self.recorder.count("scored", len(scored_rows))
         
-        if scored_lines:
-            scores = [line['score'] for line in scored_lines]
-            mean_score = sum(scores) / len(scores)
-            std_dev_score = math.sqrt(sum([(s - mean_score) ** 2 for s in scores]) / len(scores)) if len(scores) > 1 else 0
-            dynamic_threshold = mean_score + (std_dev_score * 1.75)
-            candidates = [line for line in scored_lines if line['score'] > dynamic_threshold]
-            self._refine_and_finalize(candidates)
+        candidates = []
+        if len(scored_rows):
+            with self.recorder.stage("threshold"):
+                scores = all_scores[scored_rows]
+                dynamic_threshold = scores.mean() + (scores.std() * 1.75)
+                for i in scored_rows[scores > dynamic_threshold]:
+                    line = self.lines.row(i)
+                    line['score'] = float(all_scores[i]); candidates.append(line)
+            with self.recorder.stage("refine"):
+                self._refine_and_finalize(candidates)
+        self.recorder.count("candidates", len(candidates))
         
         title_text = ""
         if self.classified_headings:
-            title_candidates = [h for h in self.classified_headings if h['page_num'] == 1 and h['y_percent'] < 0.4]
+            title_candidates = [h for h in self.classified_headings if h['page_num'] == self.first_page and h['y_percent'] < 0.4]
             if title_candidates:
                 title_obj = max(title_candidates, key=lambda x: x.get('score', 0))
                 title_text = title_obj['text']
                 self.classified_headings.remove(title_obj)
 
-        outline = [{"text": h["text"], "page": h["page_num"], "level": h.get("level", "H3")} for h in self.classified_headings]
-        outline.sort(key=lambda x: (x["page"], self._get_line_y_pos(x["text"], x["page"])))
+        # > Order by each heading's own position; repeated texts keep their true place
+        ordered = sorted(self.classified_headings, key=lambda h: (h["page_num"], h["bbox"][1], h["line_index"]))
+        outline = [{"text": h["text"], "page": h["page_num"], "level": h.get("level", "H3")} for h in ordered]
+        self.recorder.count("headings", len(outline))
         
         return {
             "title": title_text, 
@@ -245,9 +429,3 @@ class HeadingDetector:
                 if depth < 3: level = f"H{depth + 1}"
             line['level'] = level
             self.classified_headings.append(line)
-            
-    def _get_line_y_pos(self, text: str, page_num: int) -> float:
-        for line in self.lines:
-            if line["text"] == text and line["page_num"] == page_num:
-                return line["bbox"][1]
-        return float('inf')
\ No newline at end of file
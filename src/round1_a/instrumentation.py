@@ -0,0 +1,53 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator
+
+
+class StageRecorder:
+    """
+    Collects wall time per pipeline stage and named counts for one document.
+    Repeated stages accumulate. to_json_line() gives one JSON Lines record.
+    """
+
+    def __init__(self, document: str = ""):
+        self.document = document
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name: str, value: int) -> None:
+        self.counts[name] = int(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "document": self.document,
+            "stages_ms": {k: round(v * 1000, 3) for k, v in self.stages.items()},
+            "total_ms": round(sum(self.stages.values()) * 1000, 3),
+            "counts": dict(self.counts),
+        }
+
+    def to_json_line(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+
+class NullRecorder:
+    """Default recorder: hands out one shared no-op context and ignores counts."""
+
+    _context = nullcontext()
+
+    def stage(self, name: str):
+        return self._context
+
+    def count(self, name: str, value: int) -> None:
+        pass
+
+
+NULL_RECORDER = NullRecorder()
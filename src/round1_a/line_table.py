@@ -0,0 +1,62 @@
+from typing import List, Dict, Any
+import numpy as np
+
+ROLES = ("content", "potential_header", "potential_footer", "noise", "h1_keyword")
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+CONTENT = ROLE_CODES["content"]
+POTENTIAL_HEADER = ROLE_CODES["potential_header"]
+POTENTIAL_FOOTER = ROLE_CODES["potential_footer"]
+NOISE = ROLE_CODES["noise"]
+H1_KEYWORD = ROLE_CODES["h1_keyword"]
+
+
+class LineTable:
+    """
+    Columnar store for merged line features.
+
+    Numeric features live in NumPy arrays indexed by line position, while the
+    string features (text, font name, script) stay in plain lists. Roles are
+    stored as small integer codes, see ROLES.
+    """
+
+    def __init__(self, lines: List[Dict[str, Any]]):
+        n = len(lines)
+        self.text: List[str] = [l["text"] for l in lines]
+        self.font_name: List[str] = [l["font_name"] for l in lines]
+        self.script: List[str] = [l["script"] for l in lines]
+
+        self.page_num = np.fromiter((l["page_num"] for l in lines), dtype=np.int32, count=n)
+        self.bbox = np.array([tuple(l["bbox"]) for l in lines], dtype=np.float64).reshape(n, 4)
+        self.font_size = np.fromiter((l["font_size"] for l in lines), dtype=np.float64, count=n)
+        self.space_before = np.fromiter((l["space_before"] for l in lines), dtype=np.float64, count=n)
+        self.y_percent = np.fromiter((l["y_percent"] for l in lines), dtype=np.float64, count=n)
+        self.is_bold = np.fromiter((bool(l["is_bold"]) for l in lines), dtype=bool, count=n)
+        self.is_all_caps = np.fromiter((bool(l["is_all_caps"]) for l in lines), dtype=bool, count=n)
+        self.word_count = np.fromiter((l["word_count"] for l in lines), dtype=np.int32, count=n)
+        self.noun_ratio = np.fromiter((l["noun_ratio"] for l in lines), dtype=np.float64, count=n)
+        self.verb_ratio = np.fromiter((l["verb_ratio"] for l in lines), dtype=np.float64, count=n)
+        self.role = np.fromiter((ROLE_CODES[l["role"]] for l in lines), dtype=np.int8, count=n)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Materialises line i as the per-line dict used by the classification pass."""
+        return {
+            "text": self.text[i],
+            "page_num": int(self.page_num[i]),
+            "bbox": tuple(self.bbox[i].tolist()),
+            "font_size": float(self.font_size[i]),
+            "font_name": self.font_name[i],
+            "script": self.script[i],
+            "role": ROLES[self.role[i]],
+            "is_bold": bool(self.is_bold[i]),
+            "is_all_caps": bool(self.is_all_caps[i]),
+            "word_count": int(self.word_count[i]),
+            "y_percent": float(self.y_percent[i]),
+            "space_before": float(self.space_before[i]),
+            "noun_ratio": float(self.noun_ratio[i]),
+            "verb_ratio": float(self.verb_ratio[i]),
+            "line_index": i,
+        }
@@ -1,54 +1,369 @@
-import json
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from src.common.pdf_parser import PDFParser
 from src.round1_a.heading_detector import HeadingDetector
+from src.round1_a.instrumentation import StageRecorder
+from src.round1_a.manifest import RunManifest
+from src.round1_a.nlp_registry import DEFAULT_DISABLE, DEFAULT_MODEL, get_nlp, package_version
+from src.round1_a.output_sink import COMPRESSIONS, MemorySink, OutputSink, PerFileSink, make_sink
+from src.round1_a.result_cache import ResultCache, code_version, config_hash, file_sha256
+
+if TYPE_CHECKING:
+    from spacy.language import Language
 
 # Definition of directories. This will be changed as per the guidelines.
 INPUT_DIR = Path("input")
 OUTPUT_DIR = Path("output")
+CACHE_DIR = Path(".cache/round1_a")
+METRICS_FILE = "metrics.jsonl"
+
+# Detector settings that affect the outline; part of the result cache key.
+# > Installed versions come from package metadata, so fast mode never imports spaCy
+DETECTOR_CONFIG = {
+    "nlp_model": DEFAULT_MODEL,
+    "nlp_model_version": package_version(DEFAULT_MODEL),
+    "spacy_version": package_version("spacy"),
+    "nlp_disable": sorted(DEFAULT_DISABLE),
+}
+
+def extract_outline(
+    pdf_path: Path,
+    nlp: Optional["Language"] = None,
+    recorder: Optional[StageRecorder] = None,
+    fast: bool = False,
+    max_pages: Optional[int] = None,
+    stream: Optional[bytes] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Runs PDFParser + HeadingDetector on one PDF and returns the outline,
+    or None when the document has no pages. fast=True skips spaCy entirely;
+    max_pages limits the outline to the first N pages and stops reading the
+    PDF shortly after them. stream holds the PDF bytes when they are already
+    in memory.
+    """
+    # > Stream pages from the PDF straight into the detector; page extraction
+    # > is therefore accounted to the "featurize" stage
+    pages = PDFParser.iter_pages(str(pdf_path), lean=True, stream=stream)
+    # > Bounded memory: no page outlives its featurization
+    detector = HeadingDetector(
+        pages, nlp=nlp, recorder=recorder, fast=fast, max_pages=max_pages, release_pages=True
+    )
+    if not detector.page_count:
+        return None
+    return detector.classify()
+
 
-def process_document(pdf_path: Path) -> None:
+def process_document(
+    pdf_path: Path,
+    nlp: Optional["Language"] = None,
+    cache: Optional[ResultCache] = None,
+    metrics: bool = False,
+    fast: bool = False,
+    max_pages: Optional[int] = None,
+    output_dir: Path = OUTPUT_DIR,
+    sink: Optional[OutputSink] = None,
+    content_hash: Optional[str] = None,
+) -> bool:
     """
     Processes a single PDF document by parsing it
-    and writes the output to a JSON file.
+    and writes the output to sink, by default a JSON file in output_dir.
+    When a cache is given and already holds this PDF's outline, parsing and
+    detection are skipped. With metrics=True, per-stage timings and counts are
+    appended to output_dir/metrics.jsonl. content_hash is the PDF's SHA-256
+    when the caller has already computed it. Returns True when an outline was written.
     """
     print(f"Processing {pdf_path.name}")
+    recorder = StageRecorder(pdf_path.name) if metrics else None
 
     try:
-        # > Parse the PDF Document
-        parsed_data = PDFParser.parse(str(pdf_path))
-        if not parsed_data or not parsed_data.get("pages"):
-            print(f"no content in {pdf_path.name}.")
-            return
-
-        # > Classifier/Detector instantiation
-        detector = HeadingDetector(parsed_data["pages"])
-        output_data = detector.classify()
-
-        #  > Output is written to a JSON file
-        output_filename = OUTPUT_DIR / f"{pdf_path.stem}.json"
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=4)
-        print(f"wrote output to {output_filename.name}")
+        config = {**DETECTOR_CONFIG, "fast": fast, "max_pages": max_pages}
+        cache_key = cache.key_for(pdf_path, config, content_hash) if cache and cache.enabled else None
+        output_data = cache.get(cache_key) if cache_key else None
+
+        if output_data is not None:
+            print(f"cache hit for {pdf_path.name}")
+            if recorder is not None:
+                recorder.count("cache_hit", 1)
+        else:
+            output_data = extract_outline(pdf_path, nlp=nlp, recorder=recorder, fast=fast, max_pages=max_pages)
+            if output_data is None:
+                print(f"no content in {pdf_path.name}.")
+                return False
+            if cache_key:
+                cache.put(cache_key, output_data)
+
+        #  > Output is written to a JSON file unless another sink is given
+        if sink is None:
+            sink = PerFileSink(output_dir)
+        sink.write(pdf_path.name, output_data)
+
+        if recorder is not None:
+            with open(output_dir / METRICS_FILE, 'a', encoding='utf-8') as f:
+                f.write(recorder.to_json_line() + "\n")
+        return True
     
     except Exception as e:
         print(f"Exception in {pdf_path.name}: {e}")
+        return False
 
 
-def main():
+def _init_worker(fast: bool = False) -> None:
+    """Pool initializer: pays the spaCy load once per worker process."""
+    if not fast:
+        get_nlp()
+
+
+def _process_in_worker(
+    pdf_path: Path,
+    cache: Optional[ResultCache],
+    metrics: bool,
+    fast: bool,
+    max_pages: Optional[int] = None,
+    output_dir: Path = OUTPUT_DIR,
+    sink: Optional[OutputSink] = None,
+    hash_content: bool = False,
+) -> Dict[str, Any]:
     """
-    Main function to run the heading extraction for all PDFs in the input directory.
+    Runs process_document in a worker. Without a sink the outline is returned
+    under "records" for the parent to write, since sinks such as a single
+    JSON lines file cannot be shared between processes. The PDF is hashed
+    once here, for the cache key and (with hash_content) the manifest, and the
+    digest is returned as "sha256".
     """
-    INPUT_DIR.mkdir(exist_ok=True)
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    sha256 = None
+    if hash_content or (cache is not None and cache.enabled):
+        try:
+            sha256 = file_sha256(pdf_path)
+        except OSError:
+            pass
+    collected = MemorySink() if sink is None else None
+    ok = process_document(
+        pdf_path, cache=cache, metrics=metrics, fast=fast, max_pages=max_pages,
+        output_dir=output_dir, sink=sink or collected, content_hash=sha256,
+    )
+    result = {
+        "file": pdf_path.name,
+        "path": pdf_path,
+        "status": "ok" if ok else "failed",
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    if sha256 is not None:
+        result["sha256"] = sha256
+    if collected is not None:
+        result["records"] = collected.records
+    return result
 
-    pdf_files = list(INPUT_DIR.glob("*.pdf"))
-    if not pdf_files:
+
+def _record_results(
+    manifest: Optional[RunManifest], sink: OutputSink, unrecorded: List[Dict[str, Any]], final: bool = False
+) -> None:
+    """
+    Writes results to the manifest once their outlines are on disk, so a crash
+    never marks a document done while it is still in the sink's buffer.
+    """
+    if final:
+        sink.flush()
+    if manifest is None or sink.buffered:
+        if manifest is None:
+            unrecorded.clear()
         return
+    for result in unrecorded:
+        manifest.record(
+            result["path"], result["status"], result["seconds"], result.get("error"), result.get("sha256")
+        )
+    unrecorded.clear()
+
+
+def run_parallel(
+    pdf_files: List[Path],
+    workers: int,
+    cache: Optional[ResultCache] = None,
+    metrics: bool = False,
+    fast: bool = False,
+    manifest: Optional[RunManifest] = None,
+    max_pages: Optional[int] = None,
+    output_dir: Path = OUTPUT_DIR,
+    sink: Optional[OutputSink] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Distributes PDFs over a process pool, largest file first so that a single
+    huge document starts early instead of becoming the tail of the batch.
+    Sinks that are not per_process are written here, in the parent, and each
+    result is written to the manifest as soon as its outline is on disk.
+    """
+    if sink is None:
+        sink = PerFileSink(output_dir)
+    worker_sink = sink if sink.per_process else None
+    pdf_files = sorted(pdf_files, key=lambda p: p.stat().st_size, reverse=True)
+    results, unrecorded = [], []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(fast,)) as pool:
+        futures = {
+            pool.submit(
+                _process_in_worker, pdf, cache, metrics, fast, max_pages, output_dir, worker_sink, manifest is not None
+            ): pdf
+            for pdf in pdf_files
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                pdf = futures[future]
+                result = {"file": pdf.name, "path": pdf, "status": "failed", "seconds": 0.0, "error": str(e)}
+            for document, output_data in result.pop("records", ()):
+                sink.write(document, output_data)
+            print(f"{result['file']}: {result['status']} in {result['seconds']}s")
+            unrecorded.append(result)
+            _record_results(manifest, sink, unrecorded)
+            results.append(result)
+    _record_results(manifest, sink, unrecorded, final=True)
+    return results
+
 
-    for pdf_file in pdf_files:
-        process_document(pdf_file)
+def run_batch(
+    pdf_files: List[Path],
+    workers: int = 1,
+    cache: Optional[ResultCache] = None,
+    metrics: bool = False,
+    fast: bool = False,
+    manifest: Optional[RunManifest] = None,
+    max_attempts: int = 3,
+    backoff: float = 2.0,
+    max_pages: Optional[int] = None,
+    output_dir: Path = OUTPUT_DIR,
+    sink: Optional[OutputSink] = None,
+    async_io: bool = False,
+    prefetch: int = 8,
+) -> List[Dict[str, Any]]:
+    """
+    Runs the batch as a resumable job. With a manifest, files already completed
+    in their current version are skipped and earlier failures are retried until
+    they have had max_attempts tries. Files failing in this run are retried
+    after backoff, 2 x backoff, ... seconds. Outlines go to sink, by default
+    one JSON file per document in output_dir. async_io=True runs each round
+    through the asyncio IngestPipeline, reading up to prefetch PDFs ahead of
+    the workers. Returns the last result per file.
+    """
+    if sink is None:
+        sink = PerFileSink(output_dir)
+    if manifest is not None:
+        todo = manifest.pending(pdf_files, max_attempts)
+        print(f"{len(pdf_files) - len(todo)} of {len(pdf_files)} documents already done or out of attempts per manifest")
+    else:
+        todo = list(pdf_files)
+
+    results: Dict[Path, Dict[str, Any]] = {}
+    for attempt in range(max_attempts):
+        if not todo:
+            break
+        if attempt:
+            delay = backoff * 2 ** (attempt - 1)
+            print(f"retrying {len(todo)} failed documents in {delay:.1f}s")
+            time.sleep(delay)
+
+        if async_io:
+            from src.round1_a.async_pipeline import run_pipeline
+            round_results = run_pipeline(
+                todo, workers=workers, cache=cache, metrics=metrics, fast=fast, manifest=manifest,
+                max_pages=max_pages, output_dir=output_dir, sink=sink, prefetch=prefetch,
+            )
+        elif workers > 1:
+            round_results = run_parallel(todo, workers, cache, metrics, fast, manifest, max_pages, output_dir, sink)
+        else:
+            # > The spaCy pipeline is loaded on the first cache miss and shared via the registry
+            round_results, unrecorded = [], []
+            for pdf_file in todo:
+                result = _process_in_worker(
+                    pdf_file, cache, metrics, fast, max_pages, output_dir, sink, manifest is not None
+                )
+                round_results.append(result)
+                unrecorded.append(result)
+                _record_results(manifest, sink, unrecorded)
+            _record_results(manifest, sink, unrecorded, final=True)
+
+        for result in round_results:
+            results[result["path"]] = result
+        todo = [
+            r["path"] for r in round_results
+            if r["status"] != "ok" and (manifest is None or manifest.entries[str(r["path"])]["attempts"] < max_attempts)
+        ]
+    return list(results.values())
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by this module's main() and the batch command of the root CLI."""
+    parser.add_argument("--input", type=Path, default=INPUT_DIR, help="directory of PDFs")
+    parser.add_argument("--output", type=Path, default=OUTPUT_DIR, help="directory for outline JSON")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="result cache directory")
+    parser.add_argument("--cache-max-mb", type=int, default=512, help="result cache size limit")
+    parser.add_argument("--no-cache", action="store_true", help="disable the result cache")
+    parser.add_argument("--metrics", action="store_true", help=f"append per-stage timings to {METRICS_FILE}")
+    parser.add_argument("--fast", action="store_true", help="heuristic POS ratios, no spaCy")
+    parser.add_argument("--max-pages", type=positive_int, default=None, help="outline only the first N pages")
+    parser.add_argument("--format", choices=("json", "jsonl"), default="json",
+                        help="one JSON file per PDF, or one compact JSON lines file for the batch")
+    parser.add_argument("--indent", type=int, default=4, help="JSON indent for --format json; 0 writes compact output")
+    parser.add_argument("--compress", choices=COMPRESSIONS, default=None, help="compress output (zstd needs zstandard)")
+    parser.add_argument("--flush-every", type=int, default=256, help="documents buffered per JSON lines write")
+    parser.add_argument("--async-io", action="store_true", help="overlap reading and writing with extraction")
+    parser.add_argument("--prefetch", type=int, default=8, help="PDFs read ahead of the workers with --async-io")
+    parser.add_argument("--manifest", type=Path, default=None,
+                        help="resumable run manifest; PDFs already done with the same settings are skipped")
+    parser.add_argument("--max-attempts", type=int, default=3, help="tries per document before giving up")
+    parser.add_argument("--retry-backoff", type=float, default=2.0, help="seconds before the first retry, doubling")
+
+
+def run_directory(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Runs a batch over every PDF in args.input as configured by add_batch_arguments."""
+    cache = ResultCache(args.cache_dir, args.cache_max_mb * 1024 * 1024, enabled=not args.no_cache)
+    manifest = None
+    if args.manifest is not None:
+        # > Same settings as the cache key, plus where and how outlines are written
+        run_key = config_hash({
+            **DETECTOR_CONFIG, "fast": args.fast, "max_pages": args.max_pages, "code_version": code_version(),
+            "output": str(args.output.resolve()), "format": args.format, "indent": args.indent,
+            "compress": args.compress,
+        })
+        manifest = RunManifest(args.manifest, run_key)
+
+    args.input.mkdir(exist_ok=True)
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    pdf_files = list(args.input.glob("*.pdf"))
+    if not pdf_files:
+        return []
+
+    start = time.perf_counter()
+    with make_sink(args.output, args.format, args.indent or None, args.compress, args.flush_every) as sink:
+        results = run_batch(
+            pdf_files, args.workers, cache, args.metrics, args.fast, manifest, args.max_attempts, args.retry_backoff,
+            args.max_pages, args.output, sink, args.async_io, args.prefetch,
+        )
+    done = sum(1 for r in results if r["status"] == "ok")
+    print(f"{done}/{len(results)} documents in {time.perf_counter() - start:.2f}s with {args.workers} workers")
+    return results
+
+
+def main():
+    """
+    Main function to run the heading extraction for all PDFs in the input directory.
+    """
+    parser = argparse.ArgumentParser(description="Round 1A heading extraction")
+    add_batch_arguments(parser)
+    run_directory(parser.parse_args())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,95 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from src.round1_a.result_cache import file_sha256
+
+
+class RunManifest:
+    """
+    Append-only JSON lines log of batch progress. Each processed file adds one
+    record with its path, size, mtime, content hash, run key, status, attempt
+    count and timing; on load the last record per path wins, so a crashed or
+    evicted run resumes from whatever was written last. run_key identifies the
+    detector configuration, code version and output target; records made under
+    another run key do not count as done.
+    """
+
+    def __init__(self, path: Path, run_key: Optional[str] = None):
+        self.path = Path(path)
+        self.run_key = run_key
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # > A torn last line from a killed run is dropped, not fatal
+                        continue
+                    self.entries[entry["path"]] = entry
+
+    def _unchanged(self, pdf_path: Path, entry: Dict[str, Any]) -> bool:
+        if entry.get("run_key") != self.run_key:
+            return False
+        stat = pdf_path.stat()
+        if stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns"):
+            return True
+        # > Same bytes under a new mtime (copied or touched) still count as done
+        return stat.st_size == entry.get("size") and file_sha256(pdf_path) == entry.get("sha256")
+
+    def pending(self, pdf_files: List[Path], max_attempts: int = 3) -> List[Path]:
+        """
+        Files that still need work: new or modified files, files last run under
+        another run key, and failures of the current version that have had
+        fewer than max_attempts tries.
+        """
+        todo = []
+        for pdf_path in pdf_files:
+            entry = self.entries.get(str(pdf_path))
+            if entry is None or not self._unchanged(pdf_path, entry):
+                todo.append(pdf_path)
+            elif entry["status"] != "ok" and entry["attempts"] < max_attempts:
+                todo.append(pdf_path)
+        return todo
+
+    def record(
+        self,
+        pdf_path: Path,
+        status: str,
+        seconds: float,
+        error: Optional[str] = None,
+        sha256: Optional[str] = None,
+    ) -> None:
+        """sha256 may be passed when the caller already hashed the bytes it processed."""
+        previous = self.entries.get(str(pdf_path))
+        stat = pdf_path.stat()
+        sha256 = sha256 or file_sha256(pdf_path)
+        attempts = 1
+        if (
+            previous and previous["status"] != "ok"
+            and previous.get("sha256") == sha256 and previous.get("run_key") == self.run_key
+        ):
+            attempts = previous["attempts"] + 1
+
+        entry = {
+            "path": str(pdf_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+            "run_key": self.run_key,
+            "status": status,
+            "attempts": attempts,
+            "seconds": seconds,
+            "finished_at": round(time.time(), 3),
+        }
+        if error:
+            entry["error"] = error
+        self.entries[entry["path"]] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,75 @@
+import threading
+from importlib import metadata
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+# spaCy is imported on first load only, so fast mode never pays for it.
+if TYPE_CHECKING:
+    from spacy.language import Language
+
+DEFAULT_MODEL = "en_core_web_sm"
+DEFAULT_DISABLE = ("parser", "ner")
+
+# Process-wide pipelines keyed by (model name, sorted disabled components).
+_registry: Dict[Tuple[str, Tuple[str, ...]], "Language"] = {}
+_lock = threading.Lock()
+
+
+def package_version(name: str) -> Optional[str]:
+    """Installed version of a distribution (spaCy, a model package), read without importing it."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _registry_key(model_name: str, disable: Iterable[str]) -> Tuple[str, Tuple[str, ...]]:
+    return model_name, tuple(sorted(set(disable)))
+
+
+def get_nlp(model_name: str = DEFAULT_MODEL, disable: Iterable[str] = DEFAULT_DISABLE) -> "Language":
+    """
+    Returns the shared spaCy pipeline for the given model and disabled components,
+    loading it on first use. Subsequent calls in the same process reuse the instance.
+    """
+    key = _registry_key(model_name, disable)
+    nlp = _registry.get(key)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        nlp = _registry.get(key)
+        if nlp is None:
+            import spacy
+            try:
+                nlp = spacy.load(model_name, disable=list(key[1]))
+            except OSError:
+                raise RuntimeError("Failed to load SpaCy model.")
+            _registry[key] = nlp
+    return nlp
+
+
+def register_nlp(nlp: "Language", model_name: str = DEFAULT_MODEL, disable: Iterable[str] = DEFAULT_DISABLE) -> None:
+    """
+    Injects a pre-warmed pipeline so later lookups for the same key skip spacy.load.
+    """
+    with _lock:
+        _registry[_registry_key(model_name, disable)] = nlp
+
+
+def pipeline_key(nlp: "Language") -> Tuple[str, ...]:
+    """
+    Identifies a pipeline by language, model name, model version and active
+    components, so memoised results survive reloads but never cross models.
+    """
+    meta = nlp.meta
+    return ("spacy", meta.get("lang", ""), meta.get("name", ""), meta.get("version", ""), *nlp.pipe_names)
+
+
+def clear_registry(model_name: Optional[str] = None) -> None:
+    """Drops cached pipelines, either all of them or those for a single model."""
+    with _lock:
+        if model_name is None:
+            _registry.clear()
+            return
+        for key in [k for k in _registry if k[0] == model_name]:
+            del _registry[key]
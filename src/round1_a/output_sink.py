@@ -0,0 +1,146 @@
+import gzip
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+COMPRESSIONS = ("gzip", "zstd")
+_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+JSONL_FILE = "outlines.jsonl"
+
+
+def open_output(path: Path, mode: str, compression: Optional[str] = None) -> BinaryIO:
+    """
+    Opens path for binary writing ("wb" or "ab"), optionally compressed.
+    zstd needs the optional zstandard package, which is imported on first use.
+    Appending to a compressed file adds a new gzip member / zstd frame, which
+    standard readers decode as one stream.
+    """
+    if compression is None:
+        return open(path, mode)
+    if compression == "gzip":
+        return gzip.open(path, mode)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd output requires the zstandard package.")
+        return zstandard.ZstdCompressor().stream_writer(open(path, mode))
+    raise ValueError(f"unknown compression {compression!r}; expected one of {COMPRESSIONS}")
+
+
+class OutputSink(ABC):
+    """
+    Destination for finished outlines. write() takes the document name and its
+    outline; buffered counts written records that are not on disk yet, and
+    flush() and close() write them out. per_process sinks can be handed to
+    worker processes and written from each of them; the others must be written
+    from the process that created them.
+    """
+
+    per_process = False
+    buffered = 0
+
+    @abstractmethod
+    def write(self, document: str, output_data: Dict[str, Any]) -> None:
+        """Stores one document's outline."""
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class PerFileSink(OutputSink):
+    """One <stem>.json file per document, as the batch driver has always written."""
+
+    per_process = True
+
+    def __init__(self, output_dir: Path, indent: Optional[int] = 4, compression: Optional[str] = None):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.indent = indent
+        self.compression = compression
+
+    def write(self, document: str, output_data: Dict[str, Any]) -> None:
+        path = self.output_dir / f"{Path(document).stem}.json{_SUFFIXES[self.compression]}"
+        with open_output(path, "wb", self.compression) as f:
+            f.write(json.dumps(output_data, ensure_ascii=False, indent=self.indent).encode("utf-8"))
+        print(f"wrote output to {path.name}")
+
+
+class JsonLinesSink(OutputSink):
+    """
+    Appends one compact {"document", "title", "outline"} record per document to
+    a single JSON lines file. Records are buffered and written every
+    flush_every documents and on close, so a crash loses at most one batch;
+    the file is opened for appending so resumed runs extend it.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        compression: Optional[str] = None,
+        flush_every: int = 256,
+        filename: str = JSONL_FILE,
+    ):
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        self.path = Path(output_dir) / f"{filename}{_SUFFIXES[compression]}"
+        self.flush_every = max(flush_every, 1)
+        self._buffer: List[bytes] = []
+        self._file = open_output(self.path, "ab", compression)
+
+    def write(self, document: str, output_data: Dict[str, Any]) -> None:
+        record = {"document": document, **output_data}
+        self._buffer.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        print(f"wrote output to {self.path.name}")
+
+
+class MemorySink(OutputSink):
+    """Keeps records in memory; workers use it to hand outlines back to a parent-side sink."""
+
+    def __init__(self):
+        self.records: List[Tuple[str, Dict[str, Any]]] = []
+
+    def write(self, document: str, output_data: Dict[str, Any]) -> None:
+        self.records.append((document, output_data))
+
+
+def make_sink(
+    output_dir: Path,
+    format: str = "json",
+    indent: Optional[int] = 4,
+    compression: Optional[str] = None,
+    flush_every: int = 256,
+) -> OutputSink:
+    """Builds the sink for a batch: "json" writes per-file output, "jsonl" a single JSON lines file."""
+    if format == "json":
+        return PerFileSink(output_dir, indent=indent, compression=compression)
+    if format == "jsonl":
+        return JsonLinesSink(output_dir, compression=compression, flush_every=flush_every)
+    raise ValueError(f"unknown output format {format!r}")
@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+class PosMemo:
+    """
+    Bounded LRU memo of (noun_ratio, verb_ratio) per tagger and exact line
+    text. Texts are not normalised, since whitespace runs become SPACE tokens
+    that change the ratios. One instance can be shared by every document a
+    worker processes, so running headers and boilerplate are tagged once. hits/misses count lookups.
+    maxsize=0 disables memoisation.
+    """
+
+    def __init__(self, maxsize: int = 50000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Tuple[Hashable, str], Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, tagger: Hashable, text: str) -> Optional[Tuple[float, float]]:
+        key = (tagger, text)
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, tagger: Hashable, text: str, value: Tuple[float, float]) -> None:
+        key = (tagger, text)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+# Process-wide memo used by HeadingDetector unless another one is passed in.
+SHARED_POS_MEMO = PosMemo()
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Modules whose source defines the outline produced for a given PDF.
+_PIPELINE_MODULES = (
+    "src/common/pdf_parser.py",
+    "src/round1_a/heading_detector.py",
+    "src/round1_a/line_table.py",
+    "src/round1_a/scoring.py",
+    "src/round1_a/script_detection.py",
+    "src/round1_a/nlp_registry.py",
+    "src/round1_a/fast_tagger.py",
+    "src/round1_a/pos_cache.py",
+    "src/round1_a/main.py",
+)
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_code_version: Optional[str] = None
+
+
+def code_version() -> str:
+    """SHA-256 over the pipeline sources, so any code change invalidates old entries."""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for module in _PIPELINE_MODULES:
+            path = _REPO_ROOT / module
+            digest.update(module.encode())
+            digest.update(path.read_bytes() if path.exists() else b"")
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of outline JSON keyed by PDF content, detector configuration
+    and code version. Entries are single files; reading an entry refreshes its
+    mtime, and writes evict the least recently used entries once the directory
+    exceeds max_bytes. The directory size is scanned once and then kept as a
+    running total; eviction rescans it (picking up writes from other processes)
+    and trims it to EVICT_TO of max_bytes, so scans stay rare under steady writes.
+    """
+
+    EVICT_TO = 0.9
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 512 * 1024 * 1024, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._size: Optional[int] = None
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key_for(self, pdf_path: Path, config: Dict[str, Any], content_hash: Optional[str] = None) -> str:
+        """content_hash is the PDF's SHA-256 when the caller has already computed it."""
+        combined = f"{content_hash or file_sha256(pdf_path)}:{config_hash(config)}:{code_version()}"
+        return hashlib.sha256(combined.encode()).hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        entry = self._entry(key)
+        try:
+            with open(entry, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        return data
+
+    def put(self, key: str, output_data: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        entry = self._entry(key)
+        data = json.dumps(output_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        if self._size is None:
+            self._size = self._scan()[1]
+        try:
+            self._size -= entry.stat().st_size
+        except OSError:
+            pass
+        os.replace(tmp, entry)
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _scan(self) -> Tuple[List[Tuple[float, int, Path]], int]:
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self) -> None:
+        entries, total = self._scan()
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes * self.EVICT_TO:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+                total -= size
+        self._size = total
@@ -0,0 +1,45 @@
+import re
+from typing import Dict
+import numpy as np
+from src.round1_a.line_table import LineTable, NOISE, POTENTIAL_FOOTER
+
+NUMBERED_PREFIX = re.compile(r'^\s*(\d{1,2}(\.\d{1,2})*|[A-Z]\.|[IVXLCDM]+\.)')
+
+
+def score_lines(table: LineTable, stats: Dict[str, float]) -> np.ndarray:
+    """
+    Hybrid heading score for every line of the table at once.
+
+    Statistical part: positive font-size z-score (x3.0) plus extra space above
+    the line relative to the document mean (x1.5). Boosts: bold +2.0,
+    all caps +1.5, noun-heavy/verb-light +2.0, CJK 【】 +5.0, numbered prefix +4.5.
+    Noise, footers, lines outside 1-34 words and lines ending in a colon score 0.
+    """
+    text = table.text
+    eligible = (
+        (table.role != NOISE) & (table.role != POTENTIAL_FOOTER)
+        & (table.word_count > 0) & (table.word_count < 35)
+        & ~np.fromiter((t.endswith((':', '：')) for t in text), dtype=bool, count=len(text))
+    )
+
+    z_size = (table.font_size - stats['mean_size']) / stats['std_dev_size']
+    if stats['mean_space'] > 0:
+        space_ratio = table.space_before / stats['mean_space']
+    else:
+        space_ratio = np.ones_like(table.space_before)
+    stat_score = np.maximum(0, z_size) * 3.0 + np.maximum(0, space_ratio - 1) * 1.5
+
+    is_cjk_bracket = np.fromiter(
+        (s == 'CJK' and '【' in t for s, t in zip(table.script, text)), dtype=bool, count=len(text)
+    )
+    is_numbered = np.fromiter(
+        (NUMBERED_PREFIX.match(t) is not None for t in text), dtype=bool, count=len(text)
+    )
+    boost = (
+        table.is_bold * 2.0
+        + table.is_all_caps * 1.5
+        + ((table.noun_ratio > 0.4) & (table.verb_ratio < 0.1)) * 2.0
+        + is_cjk_bracket * 5.0
+        + is_numbered * 4.5
+    )
+    return np.where(eligible, stat_score + boost, 0.0)
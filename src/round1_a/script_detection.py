@@ -0,0 +1,58 @@
+from typing import Dict, List, Optional, Tuple
+
+# Unicode blocks per script. Order matters: it mirrors the original lookup order.
+SCRIPT_RANGES: Dict[str, List[Tuple[int, int]]] = {
+    "Latin": [(0x0020, 0x024F)], "Cyrillic": [(0x0400, 0x052F)],
+    "Arabic": [(0x0600, 0x06FF)], "Hebrew": [(0x0590, 0x05FF)],
+    "Devanagari": [(0x0900, 0x097F)], "Bengali": [(0x0980, 0x09FF)],
+    "Gurmukhi": [(0x0A00, 0x0A7F)], "Gujarati": [(0x0A80, 0x0AFF)],
+    "Oriya": [(0x0B00, 0x0B7F)], "Tamil": [(0x0B80, 0x0BFF)],
+    "Telugu": [(0x0C00, 0x0C7F)], "Kannada": [(0x0C80, 0x0CFF)],
+    "Malayalam": [(0x0D00, 0x0D7F)], "Sinhala": [(0x0D80, 0x0DFF)],
+    "Thai": [(0x0E00, 0x0E7F)], "Lao": [(0x0E80, 0x0EFF)],
+    "Tibetan": [(0x0F00, 0x0FFF)], "Myanmar": [(0x1000, 0x109F)],
+    "Georgian": [(0x10A0, 0x10FF)], "Hangul": [(0xAC00, 0xD7AF)],
+    "Greek": [(0x0370, 0x03FF)], "Armenian": [(0x0530, 0x058F)],
+    "CJK": [(0x4E00, 0x9FFF), (0x3400, 0x4DBF), (0x3040, 0x30FF)]
+}
+
+
+def _build_tables():
+    # Dense table over the BMP for str.translate: each covered codepoint maps to a
+    # one-character script code, every other BMP codepoint to None (deleted).
+    # Codes live in the Private Use Area, which is itself uncovered, so a code in
+    # the translated text always comes from the table. Astral characters fall
+    # outside the table and pass through unchanged, but are never codes.
+    table: List[Optional[str]] = [None] * 0x10000
+    code_to_script: Dict[str, str] = {}
+    for idx, (script, ranges) in enumerate(SCRIPT_RANGES.items()):
+        code = chr(0xE000 + idx)
+        code_to_script[code] = script
+        for start, end in ranges:
+            for cp in range(start, end + 1):
+                if table[cp] is None:
+                    table[cp] = code
+    return table, code_to_script
+
+
+_CODE_TABLE, _CODE_TO_SCRIPT = _build_tables()
+
+
+def get_script(text: str) -> str:
+    """
+    Returns the dominant script of the text, or "Other" if no character is covered.
+    Ties go to the script that occurs first in the text.
+    """
+    if not text:
+        return "Other"
+
+    coded = text.translate(_CODE_TABLE)
+    best, best_count = "Other", 0
+    # dict.fromkeys keeps first-occurrence order, which settles ties
+    for code in dict.fromkeys(coded):
+        script = _CODE_TO_SCRIPT.get(code)
+        if script is not None:
+            count = coded.count(code)
+            if count > best_count:
+                best, best_count = script, count
+    return best
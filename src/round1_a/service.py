@@ -0,0 +1,133 @@
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.round1_a.main import extract_outline
+from src.round1_a.nlp_registry import get_nlp
+
+
+def _init_worker() -> None:
+    """Pool initializer: every worker loads the spaCy pipeline once at start-up."""
+    get_nlp()
+
+
+def _extract_in_worker(pdf_path: str) -> Optional[Dict[str, Any]]:
+    return extract_outline(Path(pdf_path))
+
+
+def _extract_bytes_in_worker(pdf_bytes: bytes) -> Optional[Dict[str, Any]]:
+    # > Opened straight from the request body; nothing touches the disk
+    return extract_outline(Path("<upload>"), stream=pdf_bytes)
+
+
+class ExtractionService:
+    """
+    Keeps a pool of warm worker processes and runs PDFParser + HeadingDetector
+    for each request. At most max_pending requests are in flight at once;
+    beyond that the service reports itself busy instead of queueing unboundedly.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: Optional[int] = None):
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        self.slots = threading.BoundedSemaphore(max_pending or workers * 2)
+        # > Start every worker now so the first requests do not pay the model load
+        for future in [self.pool.submit(_init_worker) for _ in range(workers)]:
+            future.result()
+
+    def extract_path(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+        return self.pool.submit(_extract_in_worker, pdf_path).result()
+
+    def extract_bytes(self, pdf_bytes: bytes) -> Optional[Dict[str, Any]]:
+        return self.pool.submit(_extract_bytes_in_worker, pdf_bytes).result()
+
+    def shutdown(self) -> None:
+        self.pool.shutdown()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: ExtractionService
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/extract":
+            self._send_json(404, {"error": "not found"})
+            return
+        if not self.service.slots.acquire(blocking=False):
+            self._send_json(503, {"error": "busy"})
+            return
+
+        start = time.perf_counter()
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                # > {"path": "/data/doc.pdf"} for files visible to the service
+                output_data = self.service.extract_path(json.loads(body)["path"])
+            else:
+                output_data = self.service.extract_bytes(body)
+        except Exception as e:
+            self._send_json(400, {"error": str(e)}, start)
+            return
+        finally:
+            self.service.slots.release()
+
+        if output_data is None:
+            self._send_json(422, {"error": "no content"}, start)
+        else:
+            self._send_json(200, output_data, start)
+
+    def _send_json(self, status: int, payload: Dict[str, Any], start: Optional[float] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if start is not None:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.send_header("X-Processing-Time-Ms", f"{latency_ms:.1f}")
+            self.log_message('"%s %s" %d %.1fms', self.command, self.path, status, latency_ms)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code="-", size="-"):
+        # > Extraction requests are logged with their latency in _send_json
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8080, workers: int = 2, max_pending: Optional[int] = None) -> None:
+    """
+    Starts the HTTP service. POST /extract takes raw PDF bytes, or a JSON body
+    {"path": ...}, and returns the outline JSON; GET /health is a liveness probe.
+    """
+    service = ExtractionService(workers=workers, max_pending=max_pending)
+    handler = type("Handler", (_Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"serving on http://{host}:{port} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round 1A heading extraction service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=2, help="worker processes")
+    parser.add_argument("--max-pending", type=int, default=None, help="in-flight request limit")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.max_pending)
+
+
+if __name__ == "__main__":
+    main()
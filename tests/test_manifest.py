@@ -0,0 +1,79 @@
+"""
+Resumable batch runs: the run manifest skips documents already done with the
+same settings, counts retries of failures and reprocesses everything when the
+configuration or output target changes.
+
+Run from the repository root: python -m pytest tests
+"""
+import argparse
+import json
+import fitz
+import pytest
+from src.round1_a.main import add_batch_arguments, run_directory
+from src.round1_a.manifest import RunManifest
+
+
+def _write_pdf(path) -> None:
+    doc = fitz.open()
+    for chapter in (1, 2):
+        page = doc.new_page()
+        page.insert_text((72, 140), f"{chapter} Chapter {chapter}", fontsize=20, fontname="hebo")
+        for y in range(180, 600, 22):
+            page.insert_text((72, y), "Body text for the manifest test.", fontsize=10, fontname="helv")
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.fixture
+def batch_dirs(tmp_path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    for name in ("a.pdf", "b.pdf"):
+        _write_pdf(input_dir / name)
+    return tmp_path
+
+
+def _run(tmp_path, *extra):
+    parser = argparse.ArgumentParser()
+    add_batch_arguments(parser)
+    args = parser.parse_args([
+        "--input", str(tmp_path / "input"), "--output", str(tmp_path / "output"), "--fast", "--no-cache",
+        "--manifest", str(tmp_path / "manifest.jsonl"), *extra,
+    ])
+    return run_directory(args)
+
+
+def test_resume_skips_finished_documents(batch_dirs):
+    assert len(_run(batch_dirs)) == 2
+    assert _run(batch_dirs) == []
+
+
+def test_config_or_output_change_reprocesses(batch_dirs):
+    _run(batch_dirs)
+    assert len(_run(batch_dirs, "--max-pages", "1")) == 2
+
+    results = _run(batch_dirs, "--max-pages", "1", "--format", "jsonl")
+    assert len(results) == 2
+    lines = (batch_dirs / "output" / "outlines.jsonl").read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["document"] for line in lines) == ["a.pdf", "b.pdf"]
+
+
+def test_failures_count_attempts_until_exhausted(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    _write_pdf(pdf_path)
+    manifest = RunManifest(tmp_path / "manifest.jsonl", run_key="k1")
+
+    manifest.record(pdf_path, "failed", 0.1, "boom")
+    manifest.record(pdf_path, "failed", 0.1, "boom")
+    assert manifest.entries[str(pdf_path)]["attempts"] == 2
+    assert manifest.pending([pdf_path], max_attempts=3) == [pdf_path]
+    assert manifest.pending([pdf_path], max_attempts=2) == []
+
+    # > Reloaded from disk, the last record wins
+    assert RunManifest(tmp_path / "manifest.jsonl", run_key="k1").pending([pdf_path], max_attempts=2) == []
+
+    # > A new run key starts the count again
+    changed = RunManifest(tmp_path / "manifest.jsonl", run_key="k2")
+    assert changed.pending([pdf_path], max_attempts=2) == [pdf_path]
+    changed.record(pdf_path, "failed", 0.1, "boom")
+    assert changed.entries[str(pdf_path)]["attempts"] == 1
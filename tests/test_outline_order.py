@@ -0,0 +1,61 @@
+"""
+Regression test for repeated heading texts: "Summary" appears twice on one
+page with a chapter heading between them, and each occurrence must keep its
+own position in the outline. Looking positions up by (text, page) puts both
+at the first one's height and moves the chapter heading after them.
+
+Run from the repository root: python -m pytest tests
+"""
+import fitz
+import pytest
+from src.common.pdf_parser import PDFParser
+from src.round1_a.heading_detector import HeadingDetector
+
+BODY = "The quick brown fox jumps over the lazy dog near the river bank today."
+# (y, text, font size) of the headings on each page
+HEADINGS = (
+    ((140, "1 Chapter 1", 20),),
+    ((220, "Summary", 16), (300, "2 Chapter 2", 20), (520, "Summary", 16)),
+    ((140, "3 Chapter 3", 20), (400, "Summary", 16)),
+)
+
+
+def _build_pdf(path: str) -> None:
+    doc = fitz.open()
+    for headings in HEADINGS:
+        page = doc.new_page()
+        for y, text, size in headings:
+            page.insert_text((72, y), text, fontsize=size, fontname="hebo")
+        y = 180
+        while y < 740:
+            if any(abs(y - heading_y) < 14 for heading_y, _, _ in headings):
+                y += 30
+                continue
+            page.insert_text((72, y), BODY, fontsize=10, fontname="helv")
+            y += 22
+    doc.save(path)
+    doc.close()
+
+
+@pytest.fixture(scope="module")
+def outline(tmp_path_factory):
+    pdf_path = str(tmp_path_factory.mktemp("pdf") / "repeated.pdf")
+    _build_pdf(pdf_path)
+    pages = PDFParser.parse(pdf_path, lean=True)["pages"]
+    return HeadingDetector(pages, fast=True).classify()
+
+
+def test_repeated_heading_keeps_each_position(outline):
+    page_two = [h["text"] for h in outline["outline"] if h["page"] == 2]
+    assert page_two == ["Summary", "2 Chapter 2", "Summary"]
+
+
+def test_outline_follows_document_order(outline):
+    assert outline["title"] == "1 Chapter 1"
+    assert [(h["text"], h["page"]) for h in outline["outline"]] == [
+        ("Summary", 2),
+        ("2 Chapter 2", 2),
+        ("Summary", 2),
+        ("3 Chapter 3", 3),
+        ("Summary", 3),
+    ]